@@ -0,0 +1,40 @@
+"""drop user invitation is_expired
+
+Revision ID: ecce2251cf71
+Revises: 4537f5e8b292
+Create Date: 2026-10-17 05:58:03.201029
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ecce2251cf71'
+down_revision: Union[str, Sequence[str], None] = '4537f5e8b292'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_column('user_invitations', 'is_expired')
+    op.create_index(
+        'ix_invitations_active',
+        'user_invitations',
+        ['tenant_id', 'email'],
+        unique=False,
+        postgresql_where=sa.text('NOT is_used'),
+        sqlite_where=sa.text('NOT is_used'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_invitations_active', table_name='user_invitations')
+    op.add_column(
+        'user_invitations',
+        sa.Column('is_expired', sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
@@ -0,0 +1,62 @@
+"""store user roles as smallint
+
+Revision ID: d96db1d7a44e
+Revises: ecce2251cf71
+Create Date: 2026-10-17 06:00:34.671898
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# Role names ordered by privilege level; the index is the stored SMALLINT value
+ROLE_NAMES = ('reader', 'contributor', 'team_lead', 'tenant_admin', 'super_admin')
+
+
+def _role_to_int(column: str) -> str:
+    cases = " ".join(
+        f"WHEN '{name}' THEN {level}" for level, name in enumerate(ROLE_NAMES)
+    )
+    return f"CASE lower({column}) {cases} ELSE 0 END"
+
+
+def _int_to_role(column: str, upper: bool = False) -> str:
+    names = [name.upper() if upper else name for name in ROLE_NAMES]
+    cases = " ".join(f"WHEN {level} THEN '{name}'" for level, name in enumerate(names))
+    return f"CASE {column} {cases} ELSE '{names[0]}' END"
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd96db1d7a44e'
+down_revision: Union[str, Sequence[str], None] = 'ecce2251cf71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('users', 'user_invitations'):
+        op.alter_column(
+            table,
+            'role',
+            existing_type=sa.String(length=20),
+            type_=sa.SmallInteger(),
+            existing_nullable=False,
+            postgresql_using=_role_to_int('role'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # users.role was an Enum column storing member names; invitations stored values
+    for table, upper in (('users', True), ('user_invitations', False)):
+        op.alter_column(
+            table,
+            'role',
+            existing_type=sa.SmallInteger(),
+            type_=sa.String(length=20),
+            existing_nullable=False,
+            postgresql_using=_int_to_role('role', upper=upper),
+        )
@@ -0,0 +1,34 @@
+"""normalize user emails to lowercase
+
+Revision ID: 797c0c217e93
+Revises: d96db1d7a44e
+Create Date: 2026-10-17 06:02:06.157259
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '797c0c217e93'
+down_revision: Union[str, Sequence[str], None] = 'd96db1d7a44e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+    op.execute("UPDATE user_invitations SET email = lower(email) WHERE email <> lower(email)")
+    op.create_check_constraint(
+        op.f('ck_users_email_lowercase'),
+        'users',
+        'email = lower(email)',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f('ck_users_email_lowercase'), 'users', type_='check')
@@ -0,0 +1,49 @@
+"""add generated user display name
+
+Revision ID: 3f97b3c2aa53
+Revises: 797c0c217e93
+Create Date: 2026-10-17 06:03:08.527250
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f97b3c2aa53'
+down_revision: Union[str, Sequence[str], None] = '797c0c217e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        'users',
+        sa.Column(
+            'display_name',
+            sa.String(length=255),
+            sa.Computed(
+                "COALESCE(NULLIF(username, ''), NULLIF(TRIM(first_name || ' ' || last_name), ''), email)",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_users_display_trgm',
+        'users',
+        ['display_name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'display_name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_display_trgm', table_name='users')
+    op.drop_column('users', 'display_name')
@@ -0,0 +1,61 @@
+"""cascade user foreign keys and index them
+
+Revision ID: 4c5a7164b798
+Revises: 3f97b3c2aa53
+Create Date: 2026-10-17 06:04:31.159202
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# (table, column, referred table) for every foreign key switched to ON DELETE CASCADE
+CASCADE_FOREIGN_KEYS = (
+    ('users', 'tenant_id', 'tenants'),
+    ('user_sessions', 'user_id', 'users'),
+    ('user_invitations', 'tenant_id', 'tenants'),
+    ('user_invitations', 'invited_by_id', 'users'),
+    ('user_invitations', 'user_id', 'users'),
+    ('audit_logs', 'user_id', 'users'),
+    ('audit_logs', 'tenant_id', 'tenants'),
+)
+
+# Foreign key columns that get a supporting btree index
+INDEXED_COLUMNS = (
+    ('users', 'tenant_id'),
+    ('user_sessions', 'user_id'),
+    ('user_invitations', 'invited_by_id'),
+    ('user_invitations', 'user_id'),
+    ('audit_logs', 'user_id'),
+    ('audit_logs', 'tenant_id'),
+)
+
+
+def _recreate_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table, column, referred in CASCADE_FOREIGN_KEYS:
+        name = op.f(f'fk_{table}_{column}_{referred}')
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'], ondelete=ondelete)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c5a7164b798'
+down_revision: Union[str, Sequence[str], None] = '3f97b3c2aa53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_foreign_keys('CASCADE')
+    for table, column in INDEXED_COLUMNS:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in INDEXED_COLUMNS:
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+    _recreate_foreign_keys(None)
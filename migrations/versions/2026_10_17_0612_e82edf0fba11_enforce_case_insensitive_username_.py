@@ -0,0 +1,35 @@
+"""enforce case-insensitive username uniqueness
+
+Revision ID: e82edf0fba11
+Revises: 4c5a7164b798
+Create Date: 2026-10-17 06:12:16.308755
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e82edf0fba11'
+down_revision: Union[str, Sequence[str], None] = '4c5a7164b798'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'uq_users_tenant_username_lower',
+        'users',
+        ['tenant_id', sa.text('lower(username)')],
+        unique=True,
+    )
+    op.drop_constraint('uq_tenant_username', 'users', type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint('uq_tenant_username', 'users', ['tenant_id', 'username'])
+    op.drop_index('uq_users_tenant_username_lower', table_name='users')
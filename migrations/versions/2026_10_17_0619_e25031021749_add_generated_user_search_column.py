@@ -0,0 +1,49 @@
+"""add generated user search column
+
+Revision ID: e25031021749
+Revises: e82edf0fba11
+Create Date: 2026-10-17 06:19:49.597395
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e25031021749'
+down_revision: Union[str, Sequence[str], None] = 'e82edf0fba11'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        'users',
+        sa.Column(
+            'search_blob',
+            sa.Text(),
+            sa.Computed(
+                "lower(first_name || ' ' || last_name || ' ' || email || ' ' || COALESCE(username, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_users_search_trgm',
+        'users',
+        ['search_blob'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'search_blob': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_search_trgm', table_name='users')
+    op.drop_column('users', 'search_blob')
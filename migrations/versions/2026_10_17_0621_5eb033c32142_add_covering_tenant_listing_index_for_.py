@@ -0,0 +1,39 @@
+"""add covering tenant listing index for users
+
+Revision ID: 5eb033c32142
+Revises: e25031021749
+Create Date: 2026-10-17 06:21:08.491433
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5eb033c32142'
+down_revision: Union[str, Sequence[str], None] = 'e25031021749'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_users_tenant_created',
+        'users',
+        ['tenant_id', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_include=[
+            'id', 'email', 'username', 'first_name', 'last_name', 'role', 'status', 'is_active'
+        ],
+    )
+    # The composite index leads with tenant_id, so it also serves the foreign key
+    op.drop_index(op.f('ix_users_tenant_id'), table_name='users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_users_tenant_id'), 'users', ['tenant_id'], unique=False)
+    op.drop_index('ix_users_tenant_created', table_name='users')
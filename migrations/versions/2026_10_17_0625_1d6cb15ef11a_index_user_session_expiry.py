@@ -0,0 +1,28 @@
+"""index user session expiry
+
+Revision ID: 1d6cb15ef11a
+Revises: 5eb033c32142
+Create Date: 2026-10-17 06:25:17.782842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d6cb15ef11a'
+down_revision: Union[str, Sequence[str], None] = '5eb033c32142'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_user_sessions_expires_at'), 'user_sessions', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_sessions_expires_at'), table_name='user_sessions')
@@ -0,0 +1,43 @@
+"""enforce lowercase tenant hostnames
+
+Revision ID: 89ddf05a7999
+Revises: 1d6cb15ef11a
+Create Date: 2026-10-17 06:34:13.506585
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '89ddf05a7999'
+down_revision: Union[str, Sequence[str], None] = '1d6cb15ef11a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("UPDATE tenants SET subdomain = lower(subdomain) WHERE subdomain <> lower(subdomain)")
+    op.execute(
+        "UPDATE tenants SET custom_domain = lower(custom_domain) "
+        "WHERE custom_domain <> lower(custom_domain)"
+    )
+    op.create_check_constraint(
+        op.f('ck_tenants_subdomain_lowercase'),
+        'tenants',
+        'subdomain = lower(subdomain)',
+    )
+    op.create_check_constraint(
+        op.f('ck_tenants_custom_domain_lowercase'),
+        'tenants',
+        'custom_domain = lower(custom_domain)',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f('ck_tenants_custom_domain_lowercase'), 'tenants', type_='check')
+    op.drop_constraint(op.f('ck_tenants_subdomain_lowercase'), 'tenants', type_='check')
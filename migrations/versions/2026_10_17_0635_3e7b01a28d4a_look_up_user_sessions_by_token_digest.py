@@ -0,0 +1,57 @@
+"""look up user sessions by token digest
+
+Revision ID: 3e7b01a28d4a
+Revises: 89ddf05a7999
+Create Date: 2026-10-17 06:35:36.314797
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e7b01a28d4a'
+down_revision: Union[str, Sequence[str], None] = '89ddf05a7999'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_sessions', sa.Column('session_token_hash', sa.LargeBinary(length=32), nullable=True))
+
+    # Backfill in Python so the digest matches UserSession.hash_token exactly
+    sessions = sa.table(
+        'user_sessions',
+        sa.column('id', sa.Uuid()),
+        sa.column('session_token', sa.String()),
+        sa.column('session_token_hash', sa.LargeBinary()),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(sessions.c.id, sessions.c.session_token)).all()
+    if rows:
+        bind.execute(
+            sessions.update()
+            .where(sessions.c.id == sa.bindparam('session_id'))
+            .values(session_token_hash=sa.bindparam('token_hash')),
+            [
+                {'session_id': row.id, 'token_hash': hashlib.sha256(row.session_token.encode()).digest()}
+                for row in rows
+            ],
+        )
+
+    op.alter_column('user_sessions', 'session_token_hash', nullable=False)
+    op.create_unique_constraint(
+        op.f('uq_user_sessions_session_token_hash'), 'user_sessions', ['session_token_hash']
+    )
+    op.drop_constraint(op.f('uq_user_sessions_session_token'), 'user_sessions', type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint(op.f('uq_user_sessions_session_token'), 'user_sessions', ['session_token'])
+    op.drop_constraint(op.f('uq_user_sessions_session_token_hash'), 'user_sessions', type_='unique')
+    op.drop_column('user_sessions', 'session_token_hash')
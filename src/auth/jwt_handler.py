@@ -3,28 +3,82 @@ JWT token management for authentication and authorization.
 Handles token creation, validation, and refresh functionality.
 """
 
+import asyncio
+import os
 import uuid
 import secrets
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Union
 
-from jose import jwt
+import bcrypt
+from jose import jwk, jwt
 from passlib.context import CryptContext
 
 from ..config import get_settings
 from ..shared.exceptions import AuthenticationError, ValidationError
 
 
+# New hashes use Argon2id; bcrypt hashes still verify and are flagged as
+# deprecated so they get rehashed on the next successful login. Built at import
+# time so hashing worker processes get an identical context.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
+
+# Legacy bcrypt hashes are verified with the native bcrypt package directly:
+# passlib's bcrypt backend fails its self-test against bcrypt>=4.1. passlib
+# still identifies them, so needs_update() flags them for rehashing.
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+# Worker processes for password hashing; None until the app starts them
+_hash_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        # bcrypt only ever hashed the first 72 bytes of a password
+        return bcrypt.checkpw(plain_password.encode()[:72], hashed_password.encode())
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def start_password_hasher(max_workers: Optional[int] = None) -> None:
+    """Start the process pool that password hashing is offloaded to."""
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count())
+
+
+def stop_password_hasher() -> None:
+    """Shut down the password hashing process pool."""
+    global _hash_executor
+    if _hash_executor is not None:
+        executor, _hash_executor = _hash_executor, None
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 class JWTHandler:
     """JWT token creation and validation handler."""
 
     def __init__(self):
         self.settings = get_settings()
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = pwd_context
 
         # Use secret key from settings or generate one
         self.secret_key = self.settings.secret_key
         self.algorithm = "HS256"
+        # Built once: given the raw secret, python-jose reconstructs the HMAC
+        # key (after first trying to parse it as a JWK) on every encode/decode
+        self._key = jwk.construct(self.secret_key, self.algorithm)
 
         # Token expiration times
         self.access_token_expire_minutes = 30
@@ -56,7 +110,7 @@ class JWTHandler:
             "type": "access"
         }
 
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        return jwt.encode(payload, self._key, algorithm=self.algorithm)
 
     def create_refresh_token(
         self,
@@ -79,14 +133,14 @@ class JWTHandler:
             "jti": str(uuid.uuid4())  # JWT ID for token tracking
         }
 
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        return jwt.encode(payload, self._key, algorithm=self.algorithm)
 
     def verify_token(self, token: str) -> Dict[str, Any]:
         """Verify and decode a JWT token."""
         try:
             payload = jwt.decode(
                 token,
-                self.secret_key,
+                self._key,
                 algorithms=[self.algorithm],
                 options={"verify_exp": True}
             )
@@ -127,6 +181,10 @@ class JWTHandler:
             "permissions": payload.get("permissions", {})
         }
 
+    def get_token_expiry(self, token: str) -> float:
+        """Return the exp claim (epoch seconds) of a token that was already verified."""
+        return float(jwt.get_unverified_claims(token)["exp"])
+
     def refresh_access_token(self, refresh_token: str) -> str:
         """Create new access token from refresh token."""
         payload = self.verify_refresh_token(refresh_token)
@@ -142,12 +200,34 @@ class JWTHandler:
         )
 
     def hash_password(self, password: str) -> str:
-        """Hash a password using bcrypt."""
-        return self.pwd_context.hash(password)
+        """Hash a password using Argon2id."""
+        return _hash_password(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return _verify_password(plain_password, hashed_password)
+
+    async def hash_password_async(self, password: str) -> str:
+        """Hash a password in the worker pool (or a thread if it isn't running)."""
+        if _hash_executor is None:
+            return await asyncio.to_thread(self.hash_password, password)
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, _hash_password, password)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password in the worker pool (or a thread if it isn't running)."""
+        if _hash_executor is None:
+            return await asyncio.to_thread(self.verify_password, plain_password, hashed_password)
+        return await asyncio.get_running_loop().run_in_executor(
+            _hash_executor, _verify_password, plain_password, hashed_password
+        )
+
+    def password_needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether a stored hash uses a deprecated scheme or outdated parameters."""
+        try:
+            return self.pwd_context.needs_update(hashed_password)
+        except ValueError:
+            # Unrecognised hash format; there is nothing to migrate from
+            return False
 
     def generate_reset_token(self, user_id: uuid.UUID, expires_hours: int = 1) -> str:
         """Generate a password reset token."""
@@ -161,7 +241,7 @@ class JWTHandler:
             "jti": str(uuid.uuid4())
         }
 
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        return jwt.encode(payload, self._key, algorithm=self.algorithm)
 
     def verify_reset_token(self, token: str) -> uuid.UUID:
         """Verify password reset token and return user ID."""
@@ -192,7 +272,7 @@ class JWTHandler:
             "jti": str(uuid.uuid4())
         }
 
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        return jwt.encode(payload, self._key, algorithm=self.algorithm)
 
     def verify_invitation_token(self, token: str) -> Dict[str, Any]:
         """Verify invitation token and return invitation data."""
@@ -220,13 +300,13 @@ class JWTHandler:
             "jti": str(uuid.uuid4())
         }
 
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        return jwt.encode(payload, self._key, algorithm=self.algorithm)
 
     def verify_api_key(self, token: str) -> Dict[str, Any]:
         """Verify API key token."""
         payload = jwt.decode(
             token,
-            self.secret_key,
+            self._key,
             algorithms=[self.algorithm],
             options={"verify_exp": False}  # API keys don't expire
         )
@@ -249,10 +329,7 @@ class JWTHandler:
         """Get token claims without verification (for debugging)."""
         try:
             # Decode without verification to inspect claims
-            return jwt.decode(
-                token,
-                options={"verify_signature": False, "verify_exp": False}
-            )
+            return jwt.get_unverified_claims(token)
         except Exception:
             return {}
 
@@ -2,26 +2,75 @@
 Authentication and user management models.
 Supports role-based access control with multi-tenant isolation.
 """
+import hashlib
 import uuid
 from datetime import datetime
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Dict, Any, Optional, List
 
-from sqlalchemy import String, Text, Boolean, DateTime, JSON, ForeignKey, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy import (
+    String, Text, Boolean, DateTime, JSON, ForeignKey, UniqueConstraint, CheckConstraint, Index, LargeBinary,
+    SmallInteger, Computed, Enum as SQLEnum, text
+)
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.sql import func
 
 from ..shared.database import Base
 
 
-class UserRole(str, Enum):
-    """User role hierarchy for RBAC."""
-    SUPER_ADMIN = "super_admin"     # Platform administrator
-    TENANT_ADMIN = "tenant_admin"   # Tenant administrator
-    TEAM_LEAD = "team_lead"         # Team leader
-    CONTRIBUTOR = "contributor"     # Regular user
-    READER = "reader"               # Read-only access
+class UserRole(IntEnum):
+    """
+    User role hierarchy for RBAC.
+    Values are ordered by privilege so role checks are plain integer comparisons.
+    """
+    READER = 0          # Read-only access
+    CONTRIBUTOR = 1     # Regular user
+    TEAM_LEAD = 2       # Team leader
+    TENANT_ADMIN = 3    # Tenant administrator
+    SUPER_ADMIN = 4     # Platform administrator
+
+    @property
+    def slug(self) -> str:
+        """Canonical string name used in API payloads and tokens."""
+        return self._slug
+
+    def __str__(self) -> str:
+        return self.slug
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.slug, format_spec)
+
+    @classmethod
+    def _missing_(cls, value: object) -> Optional["UserRole"]:
+        """Accept canonical string names such as "tenant_admin"."""
+        if isinstance(value, str):
+            return cls.__members__.get(value.upper())
+        return None
+
+
+# Slugs are read on every token mint and role serialization; Enum.name is a
+# descriptor lookup, so build each member's slug once instead of per access
+for _role in UserRole:
+    _role._slug = _role.name.lower()
+del _role
+
+
+class UserRoleType(TypeDecorator):
+    """Persists UserRole as a SMALLINT and round-trips it through the IntEnum."""
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Optional[int]:
+        if value is None:
+            return None
+        return int(UserRole(value))
+
+    def process_result_value(self, value: Optional[int], dialect: Any) -> Optional[UserRole]:
+        if value is None:
+            return None
+        return UserRole(value)
 
 
 class UserStatus(str, Enum):
@@ -53,11 +102,26 @@ class User(Base):
         default=uuid.uuid4
     )
 
-    # Basic user information
+    # Basic user information (email is stored lowercased so lookups are exact-match)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     username: Mapped[Optional[str]] = mapped_column(String(50))
     first_name: Mapped[str] = mapped_column(String(100), nullable=False)
     last_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    display_name: Mapped[str] = mapped_column(
+        String(255),
+        Computed(
+            "COALESCE(NULLIF(username, ''), NULLIF(TRIM(first_name || ' ' || last_name), ''), email)",
+            persisted=True
+        )
+    )
+    # Lowercased name/email/username used by the user search filter
+    search_blob: Mapped[str] = mapped_column(
+        Text,
+        Computed(
+            "lower(first_name || ' ' || last_name || ' ' || email || ' ' || COALESCE(username, ''))",
+            persisted=True
+        )
+    )
 
     # Authentication
     password_hash: Mapped[Optional[str]] = mapped_column(String(255))  # For local auth
@@ -69,15 +133,15 @@ class User(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False)
 
-    # Multi-tenant relationship
+    # Multi-tenant relationship (indexed by ix_users_tenant_created)
     tenant_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("tenants.id"),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False
     )
 
     # Role and permissions
-    role: Mapped[UserRole] = mapped_column(SQLEnum(UserRole), default=UserRole.READER)
+    role: Mapped[UserRole] = mapped_column(UserRoleType, default=UserRole.READER)
     permissions: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
 
     # Profile information
@@ -100,13 +164,40 @@ class User(Base):
 
     # Relationships
     tenant: Mapped["Tenant"] = relationship("Tenant", back_populates="users")
-    sessions: Mapped[List["UserSession"]] = relationship("UserSession", back_populates="user")
-    audit_logs: Mapped[List["AuditLog"]] = relationship("AuditLog", back_populates="user")
+    sessions: Mapped[List["UserSession"]] = relationship(
+        "UserSession", back_populates="user", passive_deletes=True
+    )
+    audit_logs: Mapped[List["AuditLog"]] = relationship(
+        "AuditLog", back_populates="user", passive_deletes=True
+    )
 
     # Constraints
     __table_args__ = (
-        UniqueConstraint('tenant_id', 'username', name='uq_tenant_username'),
+        # Usernames are unique per tenant regardless of case
+        Index('uq_users_tenant_username_lower', 'tenant_id', func.lower(username), unique=True),
         UniqueConstraint('tenant_id', 'external_id', name='uq_tenant_external_id'),
+        CheckConstraint('email = lower(email)', name='email_lowercase'),
+        Index(
+            'ix_users_display_trgm',
+            'display_name',
+            postgresql_using='gin',
+            postgresql_ops={'display_name': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_users_search_trgm',
+            'search_blob',
+            postgresql_using='gin',
+            postgresql_ops={'search_blob': 'gin_trgm_ops'},
+        ),
+        # Serves tenant user listings newest-first with an index-only scan
+        Index(
+            'ix_users_tenant_created',
+            'tenant_id',
+            created_at.desc(),
+            postgresql_include=[
+                'id', 'email', 'username', 'first_name', 'last_name', 'role', 'status', 'is_active'
+            ],
+        ),
     )
 
     def __repr__(self) -> str:
@@ -117,11 +208,6 @@ class User(Base):
         """Get user's full name."""
         return f"{self.first_name} {self.last_name}".strip()
 
-    @property
-    def display_name(self) -> str:
-        """Get display name for UI."""
-        return self.username or self.full_name or self.email
-
     def has_permission(self, permission: str) -> bool:
         """Check if user has a specific permission."""
         # Super admin has all permissions
@@ -131,16 +217,19 @@ class User(Base):
         # Check explicit permissions
         return self.permissions.get(permission, False)
 
+    @validates("email")
+    def _normalize_email(self, key: str, value: str) -> str:
+        """Store emails lowercased to keep lookups case-insensitive."""
+        return value.lower() if value else value
+
+    @validates("role")
+    def _validate_role(self, key: str, value: Any) -> UserRole:
+        """Coerce role names and integers to UserRole on assignment."""
+        return UserRole(value)
+
     def has_role_level(self, required_role: UserRole) -> bool:
         """Check if user has sufficient role level."""
-        role_hierarchy = {
-            UserRole.SUPER_ADMIN: 4,
-            UserRole.TENANT_ADMIN: 3,
-            UserRole.TEAM_LEAD: 2,
-            UserRole.CONTRIBUTOR: 1,
-            UserRole.READER: 0
-        }
-        return role_hierarchy.get(self.role, 0) >= role_hierarchy.get(required_role, 0)
+        return self.role >= required_role
 
     def get_preference(self, key: str, default: Any = None) -> Any:
         """Get a user preference."""
@@ -168,12 +257,14 @@ class UserSession(Base):
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("users.id"),
-        nullable=False
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
     )
 
-    # Session identification
-    session_token: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    # Session identification; lookups go through the fixed-width token digest
+    session_token: Mapped[str] = mapped_column(String(255), nullable=False)
+    session_token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, nullable=False)
     refresh_token: Mapped[Optional[str]] = mapped_column(String(255), unique=True)
 
     # Session metadata
@@ -184,7 +275,8 @@ class UserSession(Base):
     # Session lifecycle
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Indexed so expired-session cleanup can find its batches without a scan
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     last_activity_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     terminated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
@@ -194,6 +286,17 @@ class UserSession(Base):
     def __repr__(self) -> str:
         return f"<UserSession(id={self.id}, user_id={self.user_id}, active={self.is_active})>"
 
+    @staticmethod
+    def hash_token(session_token: str) -> bytes:
+        """Digest a session token the way session_token_hash stores it."""
+        return hashlib.sha256(session_token.encode()).digest()
+
+    @validates("session_token")
+    def _hash_session_token(self, key: str, value: str) -> str:
+        """Keep session_token_hash in step with the token."""
+        self.session_token_hash = self.hash_token(value)
+        return value
+
     @property
     def is_expired(self) -> bool:
         """Check if session has expired."""
@@ -226,23 +329,23 @@ class UserInvitation(Base):
     # Tenant and role assignment
     tenant_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("tenants.id"),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False
     )
-    role: Mapped[UserRole] = mapped_column(String(20), default=UserRole.READER)
+    role: Mapped[UserRole] = mapped_column(UserRoleType, default=UserRole.READER)
     permissions: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict)
 
     # Invitation metadata
     invited_by_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("users.id"),
-        nullable=False
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
     )
     message: Mapped[Optional[str]] = mapped_column(Text)
 
-    # Status tracking
+    # Status tracking (expiry is derived from expires_at, not stored)
     is_used: Mapped[bool] = mapped_column(Boolean, default=False)
-    is_expired: Mapped[bool] = mapped_column(Boolean, default=False)
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -254,19 +357,41 @@ class UserInvitation(Base):
     invited_by: Mapped["User"] = relationship("User", foreign_keys=[invited_by_id])
     user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("users.id"),
-        nullable=True
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True
+    )
+
+    # Constraints
+    __table_args__ = (
+        # Partial index over unused invitations only; expiry is applied as a
+        # runtime range predicate since now() is not allowed in index predicates.
+        Index(
+            "ix_invitations_active",
+            "tenant_id",
+            "email",
+            postgresql_where=text("NOT is_used"),
+            sqlite_where=text("NOT is_used"),
+        ),
     )
 
     def __repr__(self) -> str:
         return f"<UserInvitation(id={self.id}, email='{self.email}', role='{self.role}')>"
 
+    @validates("email")
+    def _normalize_email(self, key: str, value: str) -> str:
+        """Store emails lowercased to match User.email."""
+        return value.lower() if value else value
+
+    @property
+    def is_expired(self) -> bool:
+        """Check if invitation has expired."""
+        return datetime.utcnow() >= self.expires_at
+
     @property
     def is_valid(self) -> bool:
         """Check if invitation is still valid."""
-        if self.is_used or self.is_expired:
-            return False
-        return datetime.utcnow() < self.expires_at
+        return not self.is_used and not self.is_expired
 
 
 class AuditLog(Base):
@@ -290,11 +415,13 @@ class AuditLog(Base):
     # User and tenant context
     user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("users.id")
+        ForeignKey("users.id", ondelete="CASCADE"),
+        index=True
     )
     tenant_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("tenants.id")
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        index=True
     )
 
     # Event details
@@ -3,211 +3,482 @@ User and authentication repository for database operations.
 Supports full user management within the application for development purposes.
 """
 
+import asyncio
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Callable, Dict, Any, Iterable, Optional, List, Tuple
 
-from sqlalchemy import select, update, delete, func, and_, or_
+import structlog
+from cachetools import TTLCache
+from sqlalchemy import JSON, select, insert, update, delete, func, and_, inspect, event, bindparam, literal
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session, selectinload, load_only, make_transient_to_detached
 
-from ..shared.database import get_db_session
-from ..shared.exceptions import NotFoundError, ConflictError, DatabaseError
+from ..config import get_settings
+from ..shared.database import DatabaseSession, json_merge, wrap_db_errors
+from ..shared.exceptions import NotFoundError, ConflictError
 from ..shared.tenant_middleware import RowLevelSecurityMixin
+from ..tenants.models import Tenant
 from .models import User, UserSession, UserInvitation, UserRole, UserStatus, AuthProvider
 from .schemas import UserProfileUpdate
 
 
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+# Process-wide read-through caches for the per-request lookups. Repositories are
+# request-scoped, so entries are detached snapshots that get merged into the
+# caller's session. Other workers only see a write once the TTL expires.
+_user_cache: TTLCache = TTLCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl)
+_session_cache: TTLCache = TTLCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl)
+
+
+def _snapshot(instance: Any) -> Any:
+    """Detached copy of a loaded row that is safe to share across sessions."""
+    mapper = inspect(instance).mapper
+    copy = mapper.class_(**{attr.key: getattr(instance, attr.key) for attr in mapper.column_attrs})
+    make_transient_to_detached(copy)
+    return copy
+
+
+def _user_cache_keys(user: User) -> List[Tuple]:
+    """Every key a user can be looked up by."""
+    keys = [("id", user.id), ("email", user.email)]
+    if user.username:
+        keys.append(("username", user.tenant_id, user.username.lower()))
+    return keys
+
+
+def _cache_user(user: Optional[User]) -> Optional[User]:
+    if user is not None:
+        snapshot = _snapshot(user)
+        for key in _user_cache_keys(snapshot):
+            _user_cache[key] = snapshot
+    return user
+
+
+def _invalidate_user(user_id: uuid.UUID) -> None:
+    cached = _user_cache.pop(("id", user_id), None)
+    if cached is not None:
+        for key in _user_cache_keys(cached):
+            _user_cache.pop(key, None)
+
+
+def _invalidate_user_sessions(user_id: uuid.UUID) -> None:
+    _invalidate_users_sessions(frozenset((user_id,)))
+
+
+def _invalidate_users_sessions(user_ids: frozenset) -> None:
+    for token_hash, cached in list(_session_cache.items()):
+        if cached.user_id in user_ids:
+            _session_cache.pop(token_hash, None)
+
+
+def clear_user_caches() -> None:
+    """Empty the in-process user and session caches."""
+    _user_cache.clear()
+    _session_cache.clear()
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _replay_cache_invalidations(session: Session) -> None:
+    """Re-run invalidations once a write's transaction ends.
+
+    Reads between the write and the commit could otherwise repopulate the
+    cache with the pre-write row (or a row that was then rolled back).
+    """
+    for invalidate, args in session.info.pop("cache_invalidations", ()):
+        invalidate(*args)
+
+
+# Hot single-row lookups, built once at import. Each is compiled once into
+# SQLAlchemy's compiled cache and, on asyncpg, prepared once per connection.
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_USER_BY_USERNAME = select(User).where(
+    and_(
+        func.lower(User.username) == bindparam("username"),
+        User.tenant_id == bindparam("tenant_id")
+    )
+)
+# Credential checks only need these columns; everything else stays unloaded
+_USER_AUTH_BY_EMAIL = select(User).where(User.email == bindparam("email")).options(
+    load_only(
+        User.id,
+        User.tenant_id,
+        User.email,
+        User.password_hash,
+        User.is_active,
+        User.status,
+    )
+)
+# The credential row plus the subdomain of the user's tenant (None if it is gone)
+_USER_AUTH_WITH_SUBDOMAIN_BY_EMAIL = (
+    _USER_AUTH_BY_EMAIL
+    .outerjoin(Tenant, Tenant.id == User.tenant_id)
+    .add_columns(Tenant.subdomain)
+)
+_PASSWORD_HASH_BY_ID = select(User.password_hash).where(User.id == bindparam("user_id"))
+_USER_TENANT_LINK = (
+    select(User.status, Tenant.id.is_not(None).label("has_tenant"))
+    .outerjoin(Tenant, Tenant.id == User.tenant_id)
+    .where(User.id == bindparam("user_id"))
+)
+_SESSION_BY_TOKEN = select(UserSession).where(UserSession.session_token_hash == bindparam("token_hash"))
+_INVITATION_BY_TOKEN = select(UserInvitation).where(UserInvitation.token == bindparam("token"))
+
+
+# Last-login timestamps buffered between flushes; keyed by user so only the
+# latest login per user is written
+_login_buffer: Dict[uuid.UUID, datetime] = {}
+_login_flush_task: Optional[asyncio.Task] = None
+LOGIN_FLUSH_INTERVAL_SECONDS = 0.2
+
+
+async def flush_last_logins() -> int:
+    """Write all buffered last-login timestamps in a single transaction."""
+    global _login_buffer
+    if not _login_buffer:
+        return 0
+
+    # Swap buffers so logins arriving during the write go to the next batch
+    pending, _login_buffer = _login_buffer, {}
+
+    try:
+        async with DatabaseSession() as session:
+            # Bulk UPDATE by primary key: one executemany, one commit
+            await session.execute(
+                update(User),
+                [{"id": user_id, "last_login_at": logged_in_at} for user_id, logged_in_at in pending.items()],
+            )
+    except Exception:
+        # Keep the batch for the next flush; logins buffered meanwhile are newer
+        pending.update(_login_buffer)
+        _login_buffer = pending
+        raise
+
+    for user_id in pending:
+        _invalidate_user(user_id)
+    return len(pending)
+
+
+async def _login_flush_loop() -> None:
+    while True:
+        await asyncio.sleep(LOGIN_FLUSH_INTERVAL_SECONDS)
+        try:
+            await flush_last_logins()
+        except Exception as e:
+            logger.error("Failed to flush last login timestamps", error=str(e))
+
+
+def start_login_flusher() -> None:
+    """Start batching last-login writes in a background task."""
+    global _login_flush_task
+    if _login_flush_task is None:
+        _login_flush_task = asyncio.create_task(_login_flush_loop())
+
+
+async def stop_login_flusher() -> None:
+    """Stop the background task and write whatever is still buffered."""
+    global _login_flush_task
+    if _login_flush_task is not None:
+        _login_flush_task.cancel()
+        try:
+            await _login_flush_task
+        except asyncio.CancelledError:
+            pass
+        _login_flush_task = None
+    await flush_last_logins()
+
+
+# Relationships callers can ask bulk user queries to eager-load. Lazy loading
+# is not available on an AsyncSession, and selectinload fetches each one for the
+# whole page with a single extra IN (...) query.
+_USER_RELATIONSHIPS = {
+    "tenant": User.tenant,
+    "sessions": User.sessions,
+}
+
+
+def _related_loaders(names: Iterable[str]) -> List[Any]:
+    try:
+        return [selectinload(_USER_RELATIONSHIPS[name]) for name in names]
+    except KeyError as e:
+        raise ValueError(f"Unknown user relationship: {e.args[0]}")
+
+
+# Columns served to UserResponse by list endpoints, read as plain row mappings
+_USER_LIST_COLUMNS = (
+    User.id,
+    User.created_at,
+    User.updated_at,
+    User.email,
+    User.username,
+    User.first_name,
+    User.last_name,
+    User.role,
+    User.status,
+    User.auth_provider,
+    User.is_active,
+    User.is_verified,
+    User.tenant_id,
+    User.avatar_url,
+    User.timezone,
+    User.locale,
+    User.last_login_at,
+    User.permissions,
+)
+_USER_LIST_KEYS = tuple(column.key for column in _USER_LIST_COLUMNS)
+
+
+def _is_unique_violation(error: IntegrityError) -> bool:
+    """Whether an IntegrityError was raised by a unique constraint or index."""
+    # PostgreSQL: "duplicate key value violates unique constraint";
+    # SQLite: "UNIQUE constraint failed"
+    return "unique" in str(error.orig).lower()
+
+
 class UserRepository(RowLevelSecurityMixin):
     """Repository for user and authentication data access."""
 
-    def __init__(self, db_session: Optional[AsyncSession] = None):
+    def __init__(self, db_session: AsyncSession):
+        # Request-scoped session; the caller owns commit/rollback and closing
         self.db_session = db_session
 
-    async def _get_session(self) -> AsyncSession:
-        """Get database session."""
-        if self.db_session:
-            return self.db_session
-        async for session in get_db_session():
-            return session
+    def _invalidate(self, invalidate: Callable[..., Any], *args: Any) -> None:
+        """Drop cached entries now and again when the current transaction ends."""
+        invalidate(*args)
+        self.db_session.info.setdefault("cache_invalidations", []).append((invalidate, args))
 
+    @wrap_db_errors("create user")
     async def create_user(self, user_data: Dict[str, Any]) -> User:
         """Create a new user."""
-        async with await self._get_session() as session:
-            try:
-                # Check for email conflicts
-                existing = await self.get_user_by_email(user_data["email"])
-                if existing:
-                    raise ConflictError(f"User with email '{user_data['email']}' already exists")
-
-                # Check for username conflicts within tenant
-                if user_data.get("username"):
-                    existing_username = await self.get_user_by_username(
-                        user_data["username"],
-                        user_data["tenant_id"]
-                    )
-                    if existing_username:
-                        raise ConflictError(f"Username '{user_data['username']}' already exists in this tenant")
-
-                user = User(**user_data)
-                session.add(user)
-                await session.commit()
-                await session.refresh(user)
-
-                return user
-
-            except Exception as e:
-                await session.rollback()
-                if isinstance(e, ConflictError):
-                    raise
-                raise DatabaseError(f"Failed to create user: {str(e)}")
-
+        # Email and per-tenant username uniqueness are enforced by the
+        # database, so the INSERT itself is the conflict check.
+        user = User(**user_data)
+        self.db_session.add(user)
+        try:
+            # Server defaults and the generated display_name come back via RETURNING
+            await self.db_session.flush()
+        except IntegrityError as e:
+            if not _is_unique_violation(e):
+                raise
+            if "email" in str(e.orig):
+                raise ConflictError(f"User with email '{user_data['email']}' already exists") from e
+            raise ConflictError(f"Username '{user_data.get('username')}' already exists in this tenant") from e
+
+        # Reads later in this transaction may cache the not yet committed row
+        self._invalidate(_invalidate_user, user.id)
+
+        return user
+
+    @wrap_db_errors("get user")
     async def get_user_by_id(self, user_id: uuid.UUID) -> Optional[User]:
         """Get user by ID."""
-        async with await self._get_session() as session:
-            try:
-                stmt = select(User).where(User.id == user_id)
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
-            except Exception as e:
-                raise DatabaseError(f"Failed to get user: {str(e)}")
+        cached = _user_cache.get(("id", user_id))
+        if cached is not None:
+            return await self.db_session.merge(cached, load=False)
+
+        result = await self.db_session.execute(_USER_BY_ID, {"user_id": user_id})
+        return _cache_user(result.scalar_one_or_none())
 
+    @wrap_db_errors("get user by email")
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email address."""
-        async with await self._get_session() as session:
-            try:
-                stmt = select(User).where(func.lower(User.email) == email.lower())
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
-            except Exception as e:
-                raise DatabaseError(f"Failed to get user by email: {str(e)}")
-
+        cached = _user_cache.get(("email", email.lower()))
+        if cached is not None:
+            return await self.db_session.merge(cached, load=False)
+
+        # Emails are stored lowercased, so this hits the unique index directly
+        result = await self.db_session.execute(_USER_BY_EMAIL, {"email": email.lower()})
+        return _cache_user(result.scalar_one_or_none())
+
+    @wrap_db_errors("get user by email")
+    async def get_user_auth_by_email(self, email: str) -> Optional[User]:
+        """Get the credential columns of a user by email address.
+
+        Only id, tenant_id, email, password_hash, is_active and status are
+        loaded; use get_user_by_email when the full profile is needed.
+        """
+        # Partially loaded rows are never cached
+        result = await self.db_session.execute(_USER_AUTH_BY_EMAIL, {"email": email.lower()})
+        return result.scalar_one_or_none()
+
+    @wrap_db_errors("get password hash")
+    async def get_password_hash(self, user_id: uuid.UUID) -> Optional[str]:
+        """Get only a user's password hash; None if they have no local password."""
+        result = await self.db_session.execute(_PASSWORD_HASH_BY_ID, {"user_id": user_id})
+        row = result.one_or_none()
+        if row is None:
+            raise NotFoundError("User", str(user_id))
+        return row.password_hash
+
+    @wrap_db_errors("get user and tenant by email")
+    async def get_user_auth_with_tenant_subdomain(self, email: str) -> Tuple[Optional[User], Optional[str]]:
+        """Get the credential columns of a user and their tenant's subdomain in one query.
+
+        The subdomain is None when the user does not exist or their tenant
+        row is missing.
+        """
+        result = await self.db_session.execute(_USER_AUTH_WITH_SUBDOMAIN_BY_EMAIL, {"email": email.lower()})
+        row = result.one_or_none()
+        if row is None:
+            return None, None
+        return row[0], row.subdomain
+
+    @wrap_db_errors("get user tenant")
+    async def get_user_tenant_link(self, user_id: uuid.UUID) -> Optional[Tuple[UserStatus, bool]]:
+        """Get a user's status and whether their tenant exists, in one query."""
+        result = await self.db_session.execute(_USER_TENANT_LINK, {"user_id": user_id})
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return row.status, row.has_tenant
+
+    @wrap_db_errors("get user by username")
     async def get_user_by_username(self, username: str, tenant_id: uuid.UUID) -> Optional[User]:
         """Get user by username within a tenant."""
-        async with await self._get_session() as session:
-            try:
-                stmt = select(User).where(
-                    and_(
-                        func.lower(User.username) == username.lower(),
-                        User.tenant_id == tenant_id
-                    )
-                )
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
-            except Exception as e:
-                raise DatabaseError(f"Failed to get user by username: {str(e)}")
+        cached = _user_cache.get(("username", tenant_id, username.lower()))
+        if cached is not None:
+            return await self.db_session.merge(cached, load=False)
+
+        result = await self.db_session.execute(
+            _USER_BY_USERNAME,
+            {"username": username.lower(), "tenant_id": tenant_id}
+        )
+        return _cache_user(result.scalar_one_or_none())
 
+    @wrap_db_errors("update user")
     async def update_user_profile(self, user_id: uuid.UUID, update_data: UserProfileUpdate) -> Optional[User]:
         """Update user profile information."""
-        async with await self._get_session() as session:
-            try:
-                user = await self.get_user_by_id(user_id)
-                if not user:
-                    raise NotFoundError("User", str(user_id))
-
-                # Prepare update data, excluding None values
-                update_dict = update_data.model_dump(exclude_none=True)
-
-                if update_dict:
-                    # Check for username conflicts if username is being updated
-                    if "username" in update_dict:
-                        existing = await self.get_user_by_username(update_dict["username"], user.tenant_id)
-                        if existing and existing.id != user_id:
-                            raise ConflictError(f"Username '{update_dict['username']}' already exists")
-
-                    # Handle preferences separately for proper JSON merge
-                    if "preferences" in update_dict:
-                        current_prefs = user.preferences or {}
-                        new_prefs = update_dict["preferences"] or {}
-                        update_dict["preferences"] = {**current_prefs, **new_prefs}
-
-                    # Update timestamp
-                    update_dict["updated_at"] = datetime.utcnow()
-
-                    # Apply updates
-                    stmt = (
-                        update(User)
-                        .where(User.id == user_id)
-                        .values(**update_dict)
-                        .execution_options(synchronize_session=False)
-                    )
-                    await session.execute(stmt)
-                    await session.commit()
-
-                # Return updated user
-                return await self.get_user_by_id(user_id)
-
-            except Exception as e:
-                await session.rollback()
-                if isinstance(e, (ConflictError, NotFoundError)):
-                    raise
-                raise DatabaseError(f"Failed to update user: {str(e)}")
-
+        # Prepare update data, excluding None values
+        update_dict = update_data.model_dump(exclude_none=True)
+        if not update_dict:
+            user = await self.get_user_by_id(user_id)
+            if not user:
+                raise NotFoundError("User", str(user_id))
+            return user
+
+        self._invalidate(_invalidate_user, user_id)
+
+        # Merge preferences server-side so concurrent edits don't clobber each other
+        if "preferences" in update_dict:
+            update_dict["preferences"] = json_merge(
+                User.preferences, literal(update_dict["preferences"], JSON)
+            )
+
+        # Update timestamp
+        update_dict["updated_at"] = func.now()
+
+        # Apply updates and read the fresh row back in the same round-trip;
+        # username conflicts are caught by the per-tenant unique index
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**update_dict)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            result = await self.db_session.execute(stmt)
+        except IntegrityError as e:
+            if not _is_unique_violation(e):
+                raise
+            raise ConflictError(f"Username '{update_dict['username']}' already exists") from e
+
+        user = result.scalar_one_or_none()
+        if not user:
+            raise NotFoundError("User", str(user_id))
+
+        return user
+
+    @wrap_db_errors("update password")
     async def update_password(self, user_id: uuid.UUID, password_hash: str) -> bool:
         """Update user password."""
-        async with await self._get_session() as session:
-            try:
-                stmt = (
-                    update(User)
-                    .where(User.id == user_id)
-                    .values(
-                        password_hash=password_hash,
-                        password_changed_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
-                    )
-                    .execution_options(synchronize_session=False)
-                )
-                result = await session.execute(stmt)
-                await session.commit()
-
-                return result.rowcount > 0
-
-            except Exception as e:
-                await session.rollback()
-                raise DatabaseError(f"Failed to update password: {str(e)}")
-
+        self._invalidate(_invalidate_user, user_id)
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(
+                password_hash=password_hash,
+                password_changed_at=func.now(),
+                updated_at=func.now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db_session.execute(stmt)
+
+        return result.rowcount > 0
+
+    @wrap_db_errors("update password hash")
+    async def update_password_hash(self, user_id: uuid.UUID, password_hash: str) -> bool:
+        """Replace a password hash with a rehash of the same password."""
+        # Not a password change: password_changed_at and sessions are left alone
+        self._invalidate(_invalidate_user, user_id)
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(password_hash=password_hash)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db_session.execute(stmt)
+
+        return result.rowcount > 0
+
+    @wrap_db_errors("update last login")
     async def update_last_login(self, user_id: uuid.UUID) -> bool:
         """Update user's last login timestamp."""
-        async with await self._get_session() as session:
-            try:
-                stmt = (
-                    update(User)
-                    .where(User.id == user_id)
-                    .values(last_login_at=datetime.utcnow())
-                    .execution_options(synchronize_session=False)
-                )
-                result = await session.execute(stmt)
-                await session.commit()
-
-                return result.rowcount > 0
-
-            except Exception as e:
-                await session.rollback()
-                raise DatabaseError(f"Failed to update last login: {str(e)}")
-
+        if _login_flush_task is not None:
+            # Written by the background flusher together with other logins
+            _login_buffer[user_id] = datetime.utcnow()
+            return True
+
+        self._invalidate(_invalidate_user, user_id)
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(last_login_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db_session.execute(stmt)
+
+        return result.rowcount > 0
+
+    @wrap_db_errors("update user status")
     async def update_user_status(self, user_id: uuid.UUID, status: UserStatus, is_active: bool = None) -> Optional[User]:
         """Update user status and active flag."""
-        async with await self._get_session() as session:
-            try:
-                update_data = {"status": status, "updated_at": datetime.utcnow()}
-                if is_active is not None:
-                    update_data["is_active"] = is_active
-
-                stmt = (
-                    update(User)
-                    .where(User.id == user_id)
-                    .values(**update_data)
-                    .execution_options(synchronize_session=False)
-                )
-                await session.execute(stmt)
-                await session.commit()
-
-                return await self.get_user_by_id(user_id)
-
-            except Exception as e:
-                await session.rollback()
-                raise DatabaseError(f"Failed to update user status: {str(e)}")
-
+        self._invalidate(_invalidate_user, user_id)
+        update_data = {"status": status, "updated_at": func.now()}
+        if is_active is not None:
+            update_data["is_active"] = is_active
+
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**update_data)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db_session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @wrap_db_errors("assign user tenant")
+    async def assign_user_tenant(self, user_id: uuid.UUID, tenant_id: uuid.UUID, status: UserStatus) -> Optional[User]:
+        """Move a user to a tenant and set their status, returning the updated row."""
+        self._invalidate(_invalidate_user, user_id)
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(tenant_id=tenant_id, status=status, updated_at=func.now())
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db_session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @wrap_db_errors("list users")
     async def list_users(
         self,
         tenant_id: Optional[uuid.UUID] = None,
@@ -216,195 +487,238 @@ class UserRepository(RowLevelSecurityMixin):
         status: Optional[UserStatus] = None,
         role: Optional[UserRole] = None,
         search: Optional[str] = None,
-        active_only: bool = True
-    ) -> Tuple[List[User], int]:
-        """List users with filtering and pagination."""
-        async with await self._get_session() as session:
-            try:
-                # Base query
-                query = select(User)
-
-                # Apply filters
-                conditions = []
-
-                if tenant_id:
-                    conditions.append(User.tenant_id == tenant_id)
-
-                if active_only:
-                    conditions.append(User.is_active == True)
-
-                if status:
-                    conditions.append(User.status == status)
-
-                if role:
-                    conditions.append(User.role == role)
-
-                if search:
-                    search_pattern = f"%{search.lower()}%"
-                    conditions.append(
-                        or_(
-                            func.lower(User.first_name).like(search_pattern),
-                            func.lower(User.last_name).like(search_pattern),
-                            func.lower(User.email).like(search_pattern),
-                            func.lower(User.username).like(search_pattern)
-                        )
-                    )
-
-                if conditions:
-                    query = query.where(and_(*conditions))
-
-                # Get total count
-                count_query = select(func.count()).select_from(query.subquery())
-                total_result = await session.execute(count_query)
-                total = total_result.scalar()
-
-                # Apply ordering and pagination
-                query = query.order_by(User.created_at.desc()).offset(skip).limit(limit)
-
-                # Execute query
-                result = await session.execute(query)
-                users = result.scalars().all()
-
-                return list(users), total
-
-            except Exception as e:
-                raise DatabaseError(f"Failed to list users: {str(e)}")
-
+        active_only: bool = True,
+        load_related: Iterable[str] = (),
+        hydrate: bool = False
+    ) -> Tuple[List[Any], int]:
+        """List users with filtering and pagination.
+
+        Rows are returned as plain mappings of the UserResponse columns. Pass
+        hydrate=True for ORM User objects when the caller modifies them or
+        needs load_related.
+        """
+        load_related = list(load_related)
+        if load_related and not hydrate:
+            raise ValueError("load_related requires hydrate=True")
+
+        # Base query; the window count returns the filtered total with each row
+        total_column = func.count().over().label("total")
+        if hydrate:
+            query = select(User, total_column).options(*_related_loaders(load_related))
+        else:
+            query = select(*_USER_LIST_COLUMNS, total_column)
+
+        # Apply filters
+        conditions = []
+
+        if tenant_id:
+            conditions.append(User.tenant_id == tenant_id)
+
+        if active_only:
+            conditions.append(User.is_active == True)
+
+        if status:
+            conditions.append(User.status == status)
+
+        if role:
+            conditions.append(User.role == role)
+
+        if search:
+            # search_blob is already lowercased and backed by a trigram index
+            conditions.append(User.search_blob.like(f"%{search.lower()}%"))
+
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        # Apply ordering and pagination
+        query = query.order_by(User.created_at.desc()).offset(skip).limit(limit)
+
+        # Execute query
+        result = await self.db_session.execute(query)
+        rows = result.all() if hydrate else result.mappings().all()
+
+        if rows:
+            total = rows[0].total if hydrate else rows[0]["total"]
+        elif skip:
+            # A page past the end has no row to carry the total
+            count_query = select(func.count()).select_from(
+                query.limit(None).offset(None).order_by(None).subquery()
+            )
+            total = (await self.db_session.execute(count_query)).scalar()
+        else:
+            total = 0
+
+        if hydrate:
+            return [row.User for row in rows], total
+        return [{key: row[key] for key in _USER_LIST_KEYS} for row in rows], total
+
+    @wrap_db_errors("delete user")
     async def delete_user(self, user_id: uuid.UUID, soft_delete: bool = True) -> bool:
         """Delete user (soft delete by default)."""
-        async with await self._get_session() as session:
-            try:
-                if soft_delete:
-                    # Soft delete by deactivating
-                    stmt = (
-                        update(User)
-                        .where(User.id == user_id)
-                        .values(
-                            is_active=False,
-                            status=UserStatus.INACTIVE,
-                            updated_at=datetime.utcnow()
-                        )
-                        .execution_options(synchronize_session=False)
-                    )
-                else:
-                    # Hard delete
-                    stmt = delete(User).where(User.id == user_id)
-
-                result = await session.execute(stmt)
-                await session.commit()
-
-                return result.rowcount > 0
-
-            except Exception as e:
-                await session.rollback()
-                raise DatabaseError(f"Failed to delete user: {str(e)}")
+        self._invalidate(_invalidate_user, user_id)
+        if soft_delete:
+            # Soft delete by deactivating
+            stmt = (
+                update(User)
+                .where(User.id == user_id)
+                .values(
+                    is_active=False,
+                    status=UserStatus.INACTIVE,
+                    updated_at=func.now()
+                )
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            # Hard delete
+            stmt = delete(User).where(User.id == user_id)
+
+        result = await self.db_session.execute(stmt)
+
+        return result.rowcount > 0
+
+    @wrap_db_errors("delete tenant users")
+    async def delete_users_by_tenant(self, tenant_id: uuid.UUID) -> int:
+        """Hard delete all users of a tenant in a single statement."""
+        self._invalidate(_user_cache.clear)
+        # Sessions, audit logs and invitations are removed by ON DELETE CASCADE
+        stmt = (
+            delete(User)
+            .where(User.tenant_id == tenant_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db_session.execute(stmt)
+
+        return result.rowcount
 
     # Session management methods
 
+    @wrap_db_errors("create session")
     async def create_session(self, session_data: Dict[str, Any]) -> UserSession:
         """Create a new user session."""
-        async with await self._get_session() as session:
-            try:
-                user_session = UserSession(**session_data)
-                session.add(user_session)
-                await session.commit()
-                await session.refresh(user_session)
-
-                return user_session
+        user_session = UserSession(**session_data)
+        self.db_session.add(user_session)
+        # Server defaults come back with the INSERT's RETURNING clause, so no
+        # refresh SELECT is needed afterwards
+        await self.db_session.flush()
 
-            except Exception as e:
-                await session.rollback()
-                raise DatabaseError(f"Failed to create session: {str(e)}")
+        return user_session
 
+    @wrap_db_errors("get session")
     async def get_session_by_token(self, session_token: str) -> Optional[UserSession]:
         """Get session by token."""
-        async with await self._get_session() as session:
-            try:
-                stmt = select(UserSession).where(UserSession.session_token == session_token)
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
-            except Exception as e:
-                raise DatabaseError(f"Failed to get session: {str(e)}")
-
+        token_hash = UserSession.hash_token(session_token)
+        cached = _session_cache.get(token_hash)
+        if cached is not None:
+            return await self.db_session.merge(cached, load=False)
+
+        result = await self.db_session.execute(_SESSION_BY_TOKEN, {"token_hash": token_hash})
+        user_session = result.scalar_one_or_none()
+        if user_session is not None:
+            _session_cache[token_hash] = _snapshot(user_session)
+        return user_session
+
+    @wrap_db_errors("invalidate session")
     async def invalidate_session(self, user_id: uuid.UUID, session_token: str) -> bool:
         """Invalidate a specific session."""
-        async with await self._get_session() as session:
-            try:
-                stmt = (
-                    update(UserSession)
-                    .where(
-                        and_(
-                            UserSession.user_id == user_id,
-                            UserSession.session_token == session_token
-                        )
-                    )
-                    .values(
-                        is_active=False,
-                        terminated_at=datetime.utcnow()
-                    )
-                    .execution_options(synchronize_session=False)
+        token_hash = UserSession.hash_token(session_token)
+        self._invalidate(_session_cache.pop, token_hash, None)
+        stmt = (
+            update(UserSession)
+            .where(
+                and_(
+                    UserSession.user_id == user_id,
+                    UserSession.session_token_hash == token_hash
                 )
-                result = await session.execute(stmt)
-                await session.commit()
-
-                return result.rowcount > 0
-
-            except Exception as e:
-                await session.rollback()
-                raise DatabaseError(f"Failed to invalidate session: {str(e)}")
-
+            )
+            .values(
+                is_active=False,
+                terminated_at=func.now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db_session.execute(stmt)
+
+        return result.rowcount > 0
+
+    @wrap_db_errors("invalidate sessions")
     async def invalidate_all_sessions(self, user_id: uuid.UUID) -> bool:
         """Invalidate all sessions for a user."""
-        async with await self._get_session() as session:
-            try:
-                stmt = (
-                    update(UserSession)
-                    .where(UserSession.user_id == user_id)
-                    .values(
-                        is_active=False,
-                        terminated_at=datetime.utcnow()
-                    )
-                    .execution_options(synchronize_session=False)
+        self._invalidate(_invalidate_user_sessions, user_id)
+        stmt = (
+            update(UserSession)
+            .where(UserSession.user_id == user_id)
+            .values(
+                is_active=False,
+                terminated_at=func.now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db_session.execute(stmt)
+
+        return result.rowcount > 0
+
+    @wrap_db_errors("invalidate sessions")
+    async def invalidate_all_sessions_bulk(self, user_ids: Iterable[uuid.UUID]) -> int:
+        """Invalidate all sessions for several users with a single UPDATE."""
+        user_ids = frozenset(user_ids)
+        if not user_ids:
+            return 0
+
+        self._invalidate(_invalidate_users_sessions, user_ids)
+        stmt = (
+            update(UserSession)
+            .where(
+                and_(
+                    UserSession.user_id.in_(user_ids),
+                    UserSession.is_active == True
                 )
-                result = await session.execute(stmt)
-                await session.commit()
-
-                return result.rowcount > 0
-
-            except Exception as e:
-                await session.rollback()
-                raise DatabaseError(f"Failed to invalidate sessions: {str(e)}")
-
-    async def cleanup_expired_sessions(self) -> int:
-        """Clean up expired sessions."""
-        async with await self._get_session() as session:
-            try:
-                now = datetime.utcnow()
-                stmt = (
-                    update(UserSession)
-                    .where(
-                        and_(
-                            UserSession.expires_at < now,
-                            UserSession.is_active == True
-                        )
-                    )
-                    .values(
-                        is_active=False,
-                        terminated_at=now
-                    )
-                    .execution_options(synchronize_session=False)
-                )
-                result = await session.execute(stmt)
-                await session.commit()
-
-                return result.rowcount
-
-            except Exception as e:
-                await session.rollback()
-                raise DatabaseError(f"Failed to cleanup sessions: {str(e)}")
+            )
+            .values(
+                is_active=False,
+                terminated_at=func.now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db_session.execute(stmt)
+
+        return result.rowcount
+
+    @wrap_db_errors("cleanup sessions")
+    async def cleanup_expired_sessions(self, batch_size: int = 1000) -> int:
+        """
+        Delete expired sessions in bounded batches.
+        Intended for maintenance jobs: each batch is committed on its own so no
+        transaction holds locks on (or writes WAL for) every expired row at once.
+        """
+        _session_cache.clear()
+        now = datetime.utcnow()
+        expired_batch = (
+            select(UserSession.id)
+            .where(UserSession.expires_at < now)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        stmt = (
+            delete(UserSession)
+            .where(UserSession.id.in_(expired_batch))
+            .execution_options(synchronize_session=False)
+        )
+
+        deleted = 0
+        try:
+            while True:
+                result = await self.db_session.execute(stmt)
+                await self.db_session.commit()
+                deleted += result.rowcount
+                if result.rowcount < batch_size:
+                    return deleted
+        except SQLAlchemyError:
+            await self.db_session.rollback()
+            raise
 
     # Invitation management methods
 
+    @wrap_db_errors("create invitation")
     async def create_invitation(
         self,
         email: str,
@@ -416,105 +730,154 @@ class UserRepository(RowLevelSecurityMixin):
         permissions: Optional[Dict[str, Any]] = None,
         expires_days: int = 7
     ) -> UserInvitation:
-        """Create a user invitation."""
-        async with await self._get_session() as session:
-            try:
-                expires_at = datetime.utcnow() + timedelta(days=expires_days)
-
-                invitation = UserInvitation(
-                    email=email,
-                    token=token,
-                    tenant_id=tenant_id,
-                    role=role,
-                    invited_by_id=invited_by_id,
-                    message=message,
-                    permissions=permissions or {},
-                    expires_at=expires_at
-                )
-
-                session.add(invitation)
-                await session.commit()
-                await session.refresh(invitation)
-
-                return invitation
-
-            except Exception as e:
-                await session.rollback()
-                raise DatabaseError(f"Failed to create invitation: {str(e)}")
-
+        """Create a user invitation unless the email already belongs to a user.
+
+        The existence check and the insert are one INSERT ... SELECT ... WHERE
+        NOT EXISTS statement, so a user registering concurrently can't slip in
+        between them; raises ConflictError when no row was inserted.
+        """
+        # A Core insert bypasses the model's email validator, so normalize here
+        email = email.lower()
+        values = {
+            "id": uuid.uuid4(),
+            "email": email,
+            "token": token,
+            "tenant_id": tenant_id,
+            "role": role,
+            "invited_by_id": invited_by_id,
+            "message": message,
+            "permissions": permissions or {},
+            "is_used": False,
+            "expires_at": datetime.utcnow() + timedelta(days=expires_days),
+        }
+        no_user = ~select(User.id).where(User.email == email).exists()
+        stmt = (
+            insert(UserInvitation)
+            .from_select(
+                list(values),
+                select(*(
+                    literal(value, UserInvitation.__table__.c[name].type).label(name)
+                    for name, value in values.items()
+                )).where(no_user),
+            )
+            .returning(UserInvitation)
+        )
+        invitation = (await self.db_session.execute(stmt)).scalar_one_or_none()
+        if invitation is None:
+            raise ConflictError(f"User with email '{email}' already exists")
+
+        return invitation
+
+    @wrap_db_errors("get invitation")
     async def get_invitation_by_token(self, token: str) -> Optional[UserInvitation]:
         """Get invitation by token."""
-        async with await self._get_session() as session:
-            try:
-                stmt = select(UserInvitation).where(UserInvitation.token == token)
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
-            except Exception as e:
-                raise DatabaseError(f"Failed to get invitation: {str(e)}")
+        result = await self.db_session.execute(_INVITATION_BY_TOKEN, {"token": token})
+        return result.scalar_one_or_none()
 
+    @wrap_db_errors("get pending invitations")
+    async def get_pending_invitations(
+        self,
+        tenant_id: uuid.UUID,
+        email: Optional[str] = None
+    ) -> List[UserInvitation]:
+        """Get unused, unexpired invitations for a tenant."""
+        # NOT is_used matches the ix_invitations_active predicate; the
+        # expiry range check is evaluated against the partial index rows.
+        conditions = [
+            UserInvitation.tenant_id == tenant_id,
+            UserInvitation.is_used == False,
+            UserInvitation.expires_at > func.now()
+        ]
+        if email:
+            conditions.append(UserInvitation.email == email.lower())
+
+        stmt = select(UserInvitation).where(and_(*conditions))
+        result = await self.db_session.execute(stmt)
+        return list(result.scalars().all())
+
+    @wrap_db_errors("mark invitation as used")
     async def mark_invitation_used(self, invitation_id: uuid.UUID, user_id: uuid.UUID) -> bool:
         """Mark invitation as used."""
-        async with await self._get_session() as session:
-            try:
-                stmt = (
-                    update(UserInvitation)
-                    .where(UserInvitation.id == invitation_id)
-                    .values(
-                        is_used=True,
-                        used_at=datetime.utcnow(),
-                        user_id=user_id
+        stmt = (
+            update(UserInvitation)
+            .where(UserInvitation.id == invitation_id)
+            .values(
+                is_used=True,
+                used_at=func.now(),
+                user_id=user_id
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db_session.execute(stmt)
+
+        return result.rowcount > 0
+
+    @wrap_db_errors("accept invitation")
+    async def accept_invitation(self, token: str, user_data: Dict[str, Any]) -> User:
+        """
+        Create the invited user and claim the invitation atomically.
+        Both writes share a savepoint: if the invitation was already used or has
+        expired, the user insert is rolled back with it.
+        """
+        async with self.db_session.begin_nested():
+            user = await self.create_user(user_data)
+            stmt = (
+                update(UserInvitation)
+                .where(
+                    and_(
+                        UserInvitation.token == token,
+                        UserInvitation.is_used == False,
+                        UserInvitation.expires_at > func.now()
                     )
-                    .execution_options(synchronize_session=False)
                 )
-                result = await session.execute(stmt)
-                await session.commit()
-
-                return result.rowcount > 0
+                .values(
+                    is_used=True,
+                    used_at=func.now(),
+                    user_id=user.id
+                )
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.db_session.execute(stmt)
+            if result.rowcount == 0:
+                raise ConflictError("Invitation has already been used or has expired")
 
-            except Exception as e:
-                await session.rollback()
-                raise DatabaseError(f"Failed to mark invitation as used: {str(e)}")
+        return user
 
-    async def get_users_by_tenant(self, tenant_id: uuid.UUID) -> List[User]:
+    @wrap_db_errors("get users by tenant")
+    async def get_users_by_tenant(
+        self,
+        tenant_id: uuid.UUID,
+        load_related: Iterable[str] = ()
+    ) -> List[User]:
         """Get all users for a specific tenant."""
-        async with await self._get_session() as session:
-            try:
-                stmt = select(User).where(
-                    and_(
-                        User.tenant_id == tenant_id,
-                        User.is_active == True
-                    )
-                ).order_by(User.created_at)
+        stmt = select(User).where(
+            and_(
+                User.tenant_id == tenant_id,
+                User.is_active == True
+            )
+        ).order_by(User.created_at).options(*_related_loaders(load_related))
 
-                result = await session.execute(stmt)
-                return list(result.scalars().all())
-
-            except Exception as e:
-                raise DatabaseError(f"Failed to get users by tenant: {str(e)}")
+        result = await self.db_session.execute(stmt)
+        return list(result.scalars().all())
 
+    @wrap_db_errors("update user role")
     async def update_user_role(self, user_id: uuid.UUID, role: UserRole, permissions: Optional[Dict[str, Any]] = None) -> Optional[User]:
         """Update user role and permissions."""
-        async with await self._get_session() as session:
-            try:
-                update_data = {
-                    "role": role,
-                    "updated_at": datetime.utcnow()
-                }
-
-                if permissions is not None:
-                    update_data["permissions"] = permissions
-
-                stmt = (
-                    update(User)
-                    .where(User.id == user_id)
-                    .values(**update_data)
-                    .execution_options(synchronize_session=False)
-                )
-                await session.execute(stmt)
-                await session.commit()
-
-                return await self.get_user_by_id(user_id)
-
-            except Exception as e:
-                await session.rollback()
-                raise DatabaseError(f"Failed to update user role: {str(e)}")
\ No newline at end of file
+        self._invalidate(_invalidate_user, user_id)
+        update_data = {
+            "role": role,
+            "updated_at": func.now()
+        }
+
+        if permissions is not None:
+            update_data["permissions"] = permissions
+
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**update_data)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db_session.execute(stmt)
+        return result.scalar_one_or_none()
\ No newline at end of file
@@ -3,12 +3,23 @@ Authentication API routes.
 Handles user authentication, session management, and authorization.
 """
 
+import asyncio
+import hashlib
+import json
+import time
 import uuid
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Annotated, AsyncGenerator, Dict, Any, Optional, List, Tuple
+
+from cachetools import TTLCache
 
 from fastapi import APIRouter, HTTPException, Depends, status, Header, Query, Response, Form
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config import get_settings
+from ..shared.database import get_db_session
 from ..shared.models import BaseResponse
 from ..shared.exceptions import ValidationError, ConflictError, NotFoundError, AuthenticationError, DatabaseError
 from .schemas import (
@@ -17,37 +28,206 @@ from .schemas import (
     ChangePasswordRequest, UserInvitationRequest, PasswordResetRequest,
     PasswordResetConfirm
 )
+from .models import UserRole
+from .repository import UserRepository
 from .service import AuthService
 from .jwt_handler import jwt_handler
 
+# Handlers keep return annotations and the default response class so FastAPI
+# (0.130+, the floor set in pyproject.toml) serializes their results to JSON
+# bytes in pydantic-core; a custom response_class (e.g. ORJSONResponse) would
+# take them off that path.
 auth_router = APIRouter(prefix="/auth", tags=["authentication"])
 security = HTTPBearer(auto_error=False)
+settings = get_settings()
+
+# Verified bearer tokens, keyed by a digest of the token (never the token
+# itself) and holding (token expiry, user). The short TTL bounds how long a
+# deactivated user keeps access on this process.
+_current_user_cache: TTLCache = TTLCache(maxsize=settings.user_cache_size, ttl=settings.auth_cache_ttl)
+_current_user_locks: Dict[bytes, asyncio.Lock] = {}
+
+# Validates and serializes a whole list_users page in one call
+_USER_LIST_ADAPTER: TypeAdapter[List[UserResponse]] = TypeAdapter(List[UserResponse])
+
+
+def _permissions_response(role: UserRole) -> Dict[str, Any]:
+    is_admin = role >= UserRole.TENANT_ADMIN
+    return {
+        "success": True,
+        "permissions": {
+            "can_manage_users": is_admin,
+            "can_manage_tenants": role == UserRole.SUPER_ADMIN,
+            "can_manage_requirements": True,
+            "can_invite_users": is_admin,
+            "can_delete_users": is_admin
+        },
+        "role": role.slug
+    }
+
+
+# /permissions bodies depend only on the role, so they are built once and
+# shared read-only across requests
+_PERMISSIONS_RESPONSES: Dict[UserRole, Dict[str, Any]] = {
+    role: _permissions_response(role) for role in UserRole
+}
+
+
+# Probed by load balancers; the body never changes, so it is encoded once
+_HEALTH_BODY = json.dumps({
+    "status": "healthy",
+    "service": "authentication",
+    "local_auth": True,
+    "external_providers": {
+        "azure_ad": False,
+        "google": False
+    }
+}, separators=(",", ":")).encode()
+
+
+def _authentication_required() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Authentication required",
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+def _insufficient_permissions(detail: str = "Insufficient permissions") -> HTTPException:
+    return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+@lru_cache(maxsize=1)
+def _providers_body() -> bytes:
+    """Encoded /providers response.
+
+    Provider configuration is fixed for the life of the process; call
+    _providers_body.cache_clear() if it ever becomes reloadable. Reading it
+    needs no repository, so the route opens no database session.
+    """
+    auth_service = AuthService()
+    return json.dumps({
+        "providers": auth_service.get_auth_providers(),
+        "local_auth_enabled": auth_service.is_local_auth_enabled()
+    }, separators=(",", ":")).encode()
+
+
+@lru_cache(maxsize=4096)
+def _paginate(total: int, page: int, page_size: int) -> Dict[str, Any]:
+    """Pagination block for a page; cached and shared, so callers must not mutate it."""
+    total_pages = -(-total // page_size)
+    return {
+        "page": page,
+        "page_size": page_size,
+        "total_items": total,
+        "total_pages": total_pages,
+        "has_next": page < total_pages,
+        "has_previous": page > 1
+    }
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _cached_current_user(key: bytes) -> Optional[UserResponse]:
+    entry: Optional[Tuple[float, UserResponse]] = _current_user_cache.get(key)
+    if entry is None or entry[0] <= time.time():
+        return None
+    return entry[1]
+
+
+def clear_current_user_cache() -> None:
+    """Empty the verified-token cache."""
+    _current_user_cache.clear()
+
+
+def _forget_current_user(user_id: Optional[uuid.UUID] = None, token: Optional[str] = None) -> None:
+    """Drop cached verifications for a token or for every token of a user."""
+    if token is not None:
+        _current_user_cache.pop(_token_key(token), None)
+    if user_id is not None:
+        for key, (_, user) in list(_current_user_cache.items()):
+            if user.id == user_id:
+                _current_user_cache.pop(key, None)
+
+
+def _user_json_response(user: UserResponse) -> Response:
+    """Serialize an already validated user without FastAPI's response-model pass."""
+    return Response(content=user.model_dump_json(), media_type="application/json")
+
+
+async def get_user_repository(
+    session: AsyncSession = Depends(get_db_session)
+) -> AsyncGenerator[UserRepository, None]:
+    """
+    Dependency providing a repository bound to the request's database session.
+    The request is one unit of work: every read and write shares a single
+    transaction, committed when the handler succeeds and rolled back if it raises.
+    """
+    # A session that is already inside a transaction belongs to the caller
+    # (e.g. a test fixture); join it through a savepoint instead.
+    transaction = session.begin_nested() if session.in_transaction() else session.begin()
+    async with transaction:
+        yield UserRepository(session)
+
+
+async def get_auth_service(
+    user_repo: UserRepository = Depends(get_user_repository)
+) -> AuthService:
+    """
+    Dependency providing the request's AuthService.
+    FastAPI resolves it once per request, so the auth check and the handler
+    share one service and one transaction.
+    """
+    return AuthService(user_repo)
 
 
 async def get_current_user_dependency(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    auth_service: AuthService = Depends(get_auth_service)
 ) -> UserResponse:
     """Dependency to get current authenticated user."""
     if not credentials:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication required",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+        raise _authentication_required()
+
+    token = credentials.credentials
+    key = _token_key(token)
+    user = _cached_current_user(key)
+    if user is not None:
+        return user
 
     try:
-        auth_service = AuthService()
-        return await auth_service.get_current_user(credentials.credentials)
+        # Concurrent requests with the same token verify it only once
+        lock = _current_user_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            user = _cached_current_user(key)
+            if user is None:
+                user = await auth_service.get_current_user(token)
+                expires_at = jwt_handler.get_token_expiry(token)
+                _current_user_cache[key] = (expires_at, user)
+        return user
     except AuthenticationError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"}
         )
+    finally:
+        if not lock.locked():
+            _current_user_locks.pop(key, None)
+
+
+# Handler parameter types. Each Depends is declared once, and within a request
+# FastAPI resolves it once however many parameters (or sub-dependencies) use it.
+AuthServiceDep = Annotated[AuthService, Depends(get_auth_service)]
+CurrentUser = Annotated[UserResponse, Depends(get_current_user_dependency)]
+BearerCredentials = Annotated[HTTPAuthorizationCredentials, Depends(security)]
 
 
 @auth_router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register(
+    auth_service: AuthServiceDep,
     registration_data: Optional[RegisterRequest] = None,
     tenant_id: Optional[uuid.UUID] = Query(None, description="Tenant ID for direct registration"),
     # Form data parameters
@@ -77,7 +257,6 @@ async def register(
                 detail="Missing required registration data"
             )
 
-        auth_service = AuthService()
         user = await auth_service.register_user(registration_data, tenant_id)
         return user
 
@@ -106,6 +285,7 @@ async def register(
 @auth_router.post("/login")
 async def login(
     response: Response,
+    auth_service: AuthServiceDep,
     email: str = Form(...),
     password: str = Form(...),
     remember_me: Optional[str] = Form(None)
@@ -121,7 +301,6 @@ async def login(
             remember_me=remember_me_bool
         )
 
-        auth_service = AuthService()
         login_response = await auth_service.authenticate_user(login_data)
 
         # Add HX-Redirect header for HTMX to redirect to dashboard
@@ -142,10 +321,12 @@ async def login(
 
 
 @auth_router.post("/refresh")
-async def refresh_token(refresh_data: RefreshTokenRequest) -> RefreshResponse:
+async def refresh_token(
+    refresh_data: RefreshTokenRequest,
+    auth_service: AuthServiceDep
+) -> RefreshResponse:
     """Refresh access token using refresh token."""
     try:
-        auth_service = AuthService()
         token_data = await auth_service.refresh_token(refresh_data.refresh_token)
 
         return RefreshResponse(
@@ -163,12 +344,13 @@ async def refresh_token(refresh_data: RefreshTokenRequest) -> RefreshResponse:
 
 @auth_router.post("/logout")
 async def logout(
-    current_user: UserResponse = Depends(get_current_user_dependency),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    current_user: CurrentUser,
+    credentials: BearerCredentials,
+    auth_service: AuthServiceDep
 ) -> BaseResponse:
     """Logout current user."""
     try:
-        auth_service = AuthService()
+        _forget_current_user(token=credentials.credentials)
         await auth_service.logout(credentials.credentials)
 
         return BaseResponse(
@@ -186,11 +368,12 @@ async def logout(
 
 @auth_router.post("/logout-all")
 async def logout_all_sessions(
-    current_user: UserResponse = Depends(get_current_user_dependency)
+    current_user: CurrentUser,
+    auth_service: AuthServiceDep
 ) -> BaseResponse:
     """Logout user from all sessions."""
     try:
-        auth_service = AuthService()
+        _forget_current_user(user_id=current_user.id)
         await auth_service.logout_all_sessions(current_user.id)
 
         return BaseResponse(
@@ -205,23 +388,25 @@ async def logout_all_sessions(
         )
 
 
-@auth_router.get("/me")
+@auth_router.get("/me", response_model=None, responses={200: {"model": UserResponse}})
 async def get_current_user(
-    current_user: UserResponse = Depends(get_current_user_dependency)
-) -> UserResponse:
+    current_user: CurrentUser
+) -> Response:
     """Get current authenticated user information."""
-    return current_user
+    return _user_json_response(current_user)
 
 
-@auth_router.put("/me")
+@auth_router.put("/me", response_model=None, responses={200: {"model": UserResponse}})
 async def update_profile(
     update_data: UserProfileUpdate,
-    current_user: UserResponse = Depends(get_current_user_dependency)
-) -> UserResponse:
+    current_user: CurrentUser,
+    auth_service: AuthServiceDep
+) -> Response:
     """Update current user's profile."""
     try:
-        auth_service = AuthService()
-        return await auth_service.update_profile(current_user.id, update_data)
+        _forget_current_user(user_id=current_user.id)
+        user = await auth_service.update_profile(current_user.id, update_data)
+        return _user_json_response(user)
 
     except NotFoundError:
         raise HTTPException(
@@ -243,11 +428,12 @@ async def update_profile(
 @auth_router.post("/change-password")
 async def change_password(
     password_data: ChangePasswordRequest,
-    current_user: UserResponse = Depends(get_current_user_dependency)
+    current_user: CurrentUser,
+    auth_service: AuthServiceDep
 ) -> BaseResponse:
     """Change user password."""
     try:
-        auth_service = AuthService()
+        _forget_current_user(user_id=current_user.id)
         await auth_service.change_password(current_user.id, password_data)
 
         return BaseResponse(
@@ -268,10 +454,12 @@ async def change_password(
 
 
 @auth_router.post("/password-reset")
-async def request_password_reset(reset_data: PasswordResetRequest) -> BaseResponse:
+async def request_password_reset(
+    reset_data: PasswordResetRequest,
+    auth_service: AuthServiceDep
+) -> BaseResponse:
     """Request password reset token."""
     try:
-        auth_service = AuthService()
         reset_token = await auth_service.require_password_reset(reset_data.email)
 
         # In development, return the token directly
@@ -293,11 +481,16 @@ async def request_password_reset(reset_data: PasswordResetRequest) -> BaseRespon
 
 
 @auth_router.post("/password-reset/confirm")
-async def confirm_password_reset(reset_data: PasswordResetConfirm) -> BaseResponse:
+async def confirm_password_reset(
+    reset_data: PasswordResetConfirm,
+    auth_service: AuthServiceDep
+) -> BaseResponse:
     """Confirm password reset with token."""
     try:
-        auth_service = AuthService()
         await auth_service.reset_password(reset_data.token, reset_data.new_password)
+        # The service has verified the token; its subject is the user whose
+        # sessions were just ended
+        _forget_current_user(user_id=uuid.UUID(jwt_handler.get_token_claims(reset_data.token)["sub"]))
 
         return BaseResponse(
             success=True,
@@ -314,25 +507,22 @@ async def confirm_password_reset(reset_data: PasswordResetConfirm) -> BaseRespon
 @auth_router.post("/invite")
 async def invite_user(
     invitation_data: UserInvitationRequest,
-    current_user: UserResponse = Depends(get_current_user_dependency)
+    current_user: CurrentUser,
+    auth_service: AuthServiceDep
 ) -> Dict[str, Any]:
     """Invite a new user to the tenant."""
     try:
         # Check if user has permission to invite others
-        if current_user.role not in ["tenant_admin", "super_admin"]:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permissions to invite users"
-            )
+        if current_user.role < UserRole.TENANT_ADMIN:
+            raise _insufficient_permissions("Insufficient permissions to invite users")
 
-        auth_service = AuthService()
         invitation = await auth_service.invite_user(
             inviter_id=current_user.id,
             tenant_id=current_user.tenant_id,
             invitation_data=invitation_data
         )
 
-        return invitation
+        return {**invitation, "role": invitation["role"].slug}
 
     except ConflictError as e:
         raise HTTPException(
@@ -347,10 +537,12 @@ async def invite_user(
 
 
 @auth_router.get("/invitation/{token}")
-async def verify_invitation(token: str) -> Dict[str, Any]:
+async def verify_invitation(
+    token: str,
+    auth_service: AuthServiceDep
+) -> Dict[str, Any]:
     """Verify invitation token and return invitation details."""
     try:
-        auth_service = AuthService()
         invitation_data = await auth_service.verify_invitation(token)
 
         return {
@@ -369,69 +561,43 @@ async def verify_invitation(token: str) -> Dict[str, Any]:
 
 
 
-@auth_router.get("/providers")
-async def get_auth_providers() -> Dict[str, Any]:
+@auth_router.get("/providers", response_model=None)
+async def get_auth_providers() -> Response:
     """Get available authentication providers."""
-    auth_service = AuthService()
-    providers = auth_service.get_auth_providers()
-
-    return {
-        "providers": providers,
-        "local_auth_enabled": auth_service.is_local_auth_enabled()
-    }
+    return Response(content=_providers_body(), media_type="application/json")
 
 
 @auth_router.get("/permissions")
 async def get_user_permissions(
-    current_user: UserResponse = Depends(get_current_user_dependency)
+    current_user: CurrentUser
 ) -> Dict[str, Any]:
     """Get current user permissions."""
-    return {
-        "success": True,
-        "permissions": {
-            "can_manage_users": current_user.role in ["tenant_admin", "super_admin"],
-            "can_manage_tenants": current_user.role == "super_admin",
-            "can_manage_requirements": True,
-            "can_invite_users": current_user.role in ["tenant_admin", "super_admin"],
-            "can_delete_users": current_user.role in ["tenant_admin", "super_admin"]
-        },
-        "role": current_user.role
-    }
+    return _PERMISSIONS_RESPONSES[current_user.role]
 
 
-@auth_router.get("/health")
-async def auth_health_check() -> Dict[str, Any]:
+@auth_router.get("/health", response_model=None)
+async def auth_health_check() -> Response:
     """Authentication service health check."""
-    return {
-        "status": "healthy",
-        "service": "authentication",
-        "local_auth": True,
-        "external_providers": {
-            "azure_ad": False,
-            "google": False
-        }
-    }
+    # Kept async: a sync handler would be dispatched to the threadpool
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # Development endpoints for user management
 
-@auth_router.get("/users", dependencies=[Depends(get_current_user_dependency)])
+@auth_router.get("/users")
 async def list_users(
+    current_user: CurrentUser,
+    auth_service: AuthServiceDep,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    search: Optional[str] = Query(None, min_length=1, max_length=100),
-    current_user: UserResponse = Depends(get_current_user_dependency)
+    search: Optional[str] = Query(None, min_length=1, max_length=100)
 ) -> Dict[str, Any]:
     """List users in current tenant (admin only)."""
     try:
         # Check admin permissions
-        if current_user.role not in ["tenant_admin", "super_admin"]:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permissions"
-            )
+        if current_user.role < UserRole.TENANT_ADMIN:
+            raise _insufficient_permissions()
 
-        auth_service = AuthService()
         # Use repository directly for listing
         skip = (page - 1) * page_size
         users, total = await auth_service.user_repo.list_users(
@@ -441,20 +607,13 @@ async def list_users(
             search=search
         )
 
-        user_responses = [UserResponse.model_validate(user) for user in users]
-
-        total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+        # One validation pass over the whole page instead of a model per row;
+        # FastAPI then writes the models straight to JSON bytes
+        user_responses = _USER_LIST_ADAPTER.validate_python(users)
 
         return {
             "users": user_responses,
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total_items": total,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_previous": page > 1
-            }
+            "pagination": _paginate(total, page, page_size)
         }
 
     except DatabaseError as e:
@@ -467,16 +626,14 @@ async def list_users(
 @auth_router.delete("/users/{user_id}")
 async def delete_user(
     user_id: uuid.UUID,
-    current_user: UserResponse = Depends(get_current_user_dependency)
+    current_user: CurrentUser,
+    auth_service: AuthServiceDep
 ) -> BaseResponse:
     """Delete a user (admin only)."""
     try:
         # Check admin permissions
-        if current_user.role not in ["tenant_admin", "super_admin"]:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permissions"
-            )
+        if current_user.role < UserRole.TENANT_ADMIN:
+            raise _insufficient_permissions()
 
         # Prevent self-deletion
         if user_id == current_user.id:
@@ -485,7 +642,7 @@ async def delete_user(
                 detail="Cannot delete your own account"
             )
 
-        auth_service = AuthService()
+        _forget_current_user(user_id=user_id)
         success = await auth_service.user_repo.delete_user(user_id, soft_delete=True)
 
         if not success:
@@ -3,15 +3,22 @@ Authentication Pydantic schemas for API validation and serialization.
 Handles login, registration, and user management requests.
 """
 
+import re
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Annotated, Dict, Any, Optional
 
-from pydantic import BaseModel, Field, EmailStr, validator
+from pydantic import BaseModel, Field, EmailStr, PlainSerializer, field_validator, model_validator
 
 from ..shared.models import BaseEntity, BaseResponse
 from .models import UserRole, UserStatus, AuthProvider
 
+# Roles are integer-backed internally but keep their canonical string names on the wire.
+# BaseEntity's use_enum_values stores the bare int, so coerce back before naming it.
+RoleName = Annotated[UserRole, PlainSerializer(lambda role: UserRole(role).slug, return_type=str)]
+
+_DIGIT = re.compile(r"\d")
+
 
 class LoginRequest(BaseModel):
     """User login request schema."""
@@ -26,14 +33,6 @@ class LoginRequest(BaseModel):
     )
     remember_me: bool = Field(default=False, description="Extended session duration")
 
-    @validator("password")
-    @classmethod
-    def validate_password(cls, v: str) -> str:
-        """Validate password complexity."""
-        if len(v) < 8:
-            raise ValueError("Password must be at least 8 characters long")
-        return v
-
 
 class RegisterRequest(BaseModel):
     """User registration request schema."""
@@ -55,24 +54,23 @@ class RegisterRequest(BaseModel):
         description="Invitation token for tenant access"
     )
 
-    @validator("confirm_password")
-    @classmethod
-    def validate_passwords_match(cls, v: str, values: Dict[str, Any]) -> str:
+    @model_validator(mode="after")
+    def validate_passwords_match(self) -> "RegisterRequest":
         """Validate that passwords match."""
-        if "password" in values and v != values["password"]:
+        if self.confirm_password != self.password:
             raise ValueError("Passwords do not match")
-        return v
+        return self
 
-    @validator("password")
+    @field_validator("password", mode="after")
     @classmethod
     def validate_password_complexity(cls, v: str) -> str:
         """Validate password complexity requirements."""
-        if len(v) < 8:
-            raise ValueError("Password must be at least 8 characters long")
-
-        has_upper = any(c.isupper() for c in v)
-        has_lower = any(c.islower() for c in v)
-        has_digit = any(c.isdigit() for c in v)
+        # Length is already enforced by the field's min_length/max_length.
+        # Case conversion and the regex each scan the string in C; a string
+        # with an uppercase letter changes when lowercased and vice versa.
+        has_upper = v != v.lower()
+        has_lower = v != v.upper()
+        has_digit = _DIGIT.search(v) is not None
 
         if not (has_upper and has_lower and has_digit):
             raise ValueError(
@@ -100,13 +98,12 @@ class PasswordResetConfirm(BaseModel):
     new_password: str = Field(min_length=8, max_length=128, description="New password")
     confirm_password: str = Field(min_length=8, max_length=128, description="Password confirmation")
 
-    @validator("confirm_password")
-    @classmethod
-    def validate_passwords_match(cls, v: str, values: Dict[str, Any]) -> str:
+    @model_validator(mode="after")
+    def validate_passwords_match(self) -> "PasswordResetConfirm":
         """Validate that passwords match."""
-        if "new_password" in values and v != values["new_password"]:
+        if self.confirm_password != self.new_password:
             raise ValueError("Passwords do not match")
-        return v
+        return self
 
 
 class RefreshTokenRequest(BaseModel):
@@ -122,7 +119,7 @@ class UserResponse(BaseEntity):
     username: Optional[str]
     first_name: str
     last_name: str
-    role: UserRole
+    role: RoleName
     status: UserStatus
     auth_provider: AuthProvider
     is_active: bool
@@ -144,6 +141,11 @@ class UserResponse(BaseEntity):
         """Get display name for UI."""
         return self.username or self.full_name or self.email
 
+    @property
+    def role_name(self) -> str:
+        """Get the canonical role name, e.g. "tenant_admin", for the UI."""
+        return UserRole(self.role).slug
+
 
 class LoginResponse(BaseResponse):
     """Login response schema."""
@@ -214,20 +216,19 @@ class ChangePasswordRequest(BaseModel):
     new_password: str = Field(min_length=8, max_length=128, description="New password")
     confirm_password: str = Field(min_length=8, max_length=128, description="Password confirmation")
 
-    @validator("confirm_password")
-    @classmethod
-    def validate_passwords_match(cls, v: str, values: Dict[str, Any]) -> str:
+    @model_validator(mode="after")
+    def validate_passwords_match(self) -> "ChangePasswordRequest":
         """Validate that passwords match."""
-        if "new_password" in values and v != values["new_password"]:
+        if self.confirm_password != self.new_password:
             raise ValueError("Passwords do not match")
-        return v
+        return self
 
 
 class UserInvitationRequest(BaseModel):
     """User invitation request schema."""
 
     email: EmailStr = Field(description="Invitee email address")
-    role: UserRole = Field(description="Assigned role")
+    role: RoleName = Field(description="Assigned role")
     permissions: Optional[Dict[str, Any]] = Field(
         default_factory=dict,
         description="Additional permissions"
@@ -244,7 +245,7 @@ class UserInvitationResponse(BaseResponse):
 
     invitation_id: uuid.UUID = Field(description="Invitation ID")
     email: str = Field(description="Invitee email")
-    role: UserRole = Field(description="Assigned role")
+    role: RoleName = Field(description="Assigned role")
     expires_at: datetime = Field(description="Invitation expiration")
     invitation_url: str = Field(description="Invitation acceptance URL")
 
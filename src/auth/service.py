@@ -3,10 +3,14 @@ Authentication service layer with local authentication support.
 Handles user authentication, registration, and session management without requiring external providers.
 """
 
+import secrets
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, Any, Optional, Tuple
 
+import structlog
+
 from ..shared.exceptions import AuthenticationError, ValidationError, ConflictError, NotFoundError
 from ..shared.redis_client import RedisClient
 from .models import User, UserSession, UserInvitation, UserRole, UserStatus, AuthProvider
@@ -17,13 +21,45 @@ from .schemas import (
 from .jwt_handler import jwt_handler
 from .repository import UserRepository
 
+logger = structlog.get_logger(__name__)
+
+# Session lifetimes for a login with and without "remember me"
+_SESSION_TTL_REMEMBER = timedelta(days=7)
+_SESSION_TTL_DEFAULT = timedelta(days=1)
+
+
+def _utcnow() -> datetime:
+    # Naive UTC, as UserSession.is_expired compares against, without the
+    # deprecated datetime.utcnow()
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Hash of a random password, verified against when a login names no account
+_dummy_hash: Optional[str] = None
+
+
+async def _dummy_password_hash() -> str:
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await jwt_handler.hash_password_async(secrets.token_urlsafe(16))
+    return _dummy_hash
+
+
+@lru_cache(maxsize=1)
+def _shared_redis_client() -> RedisClient:
+    """Redis wrapper shared by every AuthService; it holds no request state."""
+    return RedisClient()
+
 
 class AuthService:
     """Authentication service with local auth support."""
 
     def __init__(self, user_repo: Optional[UserRepository] = None, redis_client: Optional[RedisClient] = None):
-        self.user_repo = user_repo or UserRepository()
-        self.redis_client = redis_client or RedisClient()
+        # Repositories are bound to a request-scoped session, so they are always
+        # supplied by the caller; without one only configuration helpers work.
+        # Everything else is process-wide, keeping per-request construction cheap.
+        self.user_repo = user_repo
+        self.redis_client = redis_client or _shared_redis_client()
 
     async def register_user(
         self,
@@ -43,7 +79,7 @@ class AuthService:
             raise ConflictError(f"User with email '{registration_data.email}' already exists")
 
         # Hash password
-        password_hash = jwt_handler.hash_password(registration_data.password)
+        password_hash = await jwt_handler.hash_password_async(registration_data.password)
 
         # Determine role from invitation or default
         role = UserRole.READER
@@ -72,49 +108,48 @@ class AuthService:
             "is_active": True
         }
 
-        user = await self.user_repo.create_user(user_data)
+        if invitation_data:
+            user = await self.user_repo.accept_invitation(registration_data.invitation_token, user_data)
+        else:
+            user = await self.user_repo.create_user(user_data)
         return UserResponse.model_validate(user)
 
     async def user_needs_tenant(self, user_id: uuid.UUID) -> bool:
         """Check if user needs to create or join a tenant."""
-        user = await self.user_repo.get_user_by_id(user_id)
-        if not user:
+        link = await self.user_repo.get_user_tenant_link(user_id)
+        if link is None:
             return True
 
-        # Check if user's tenant actually exists
-        from ..tenants.repository import TenantRepository
-        tenant_repo = TenantRepository()
-        tenant = await tenant_repo.get_tenant_by_id(user.tenant_id)
-
-        return tenant is None or user.status == UserStatus.PENDING
+        # The user's tenant may not have been created yet
+        status, has_tenant = link
+        return not has_tenant or status == UserStatus.PENDING
 
     async def link_user_to_tenant(self, user_id: uuid.UUID, tenant_id: uuid.UUID) -> UserResponse:
         """Link a user to a tenant and activate their account."""
-        user = await self.user_repo.get_user_by_id(user_id)
+        # Update user with real tenant and activate; the updated row comes back with it
+        user = await self.user_repo.assign_user_tenant(user_id, tenant_id, UserStatus.ACTIVE)
         if not user:
             raise NotFoundError("User", str(user_id))
 
-        # Update user with real tenant and activate
-        await self.user_repo.update_user_profile(
-            user_id,
-            {
-                "tenant_id": tenant_id,
-                "status": UserStatus.ACTIVE
-            }
-        )
-
-        updated_user = await self.user_repo.get_user_by_id(user_id)
-        return UserResponse.model_validate(updated_user)
+        return UserResponse.model_validate(user)
 
     async def authenticate_user(self, login_data: LoginRequest) -> LoginResponse:
         """Authenticate user with email/password."""
-        # Get user by email
-        user = await self.user_repo.get_user_by_email(login_data.email)
-        if not user:
+        # Check credentials against the narrow auth row first; when a tenant
+        # is named, its subdomain comes back with the same query
+        tenant_subdomain = None
+        if login_data.tenant_subdomain:
+            user, tenant_subdomain = await self.user_repo.get_user_auth_with_tenant_subdomain(login_data.email)
+        else:
+            user = await self.user_repo.get_user_auth_by_email(login_data.email)
+        if not user or not user.password_hash:
+            # Do the same hashing work as a real check so the response time
+            # doesn't reveal whether the email belongs to an account
+            await jwt_handler.verify_password_async(login_data.password, await _dummy_password_hash())
             raise AuthenticationError("Invalid email or password")
 
         # Verify password
-        if not user.password_hash or not jwt_handler.verify_password(login_data.password, user.password_hash):
+        if not await jwt_handler.verify_password_async(login_data.password, user.password_hash):
             raise AuthenticationError("Invalid email or password")
 
         # Check user status
@@ -127,21 +162,25 @@ class AuthService:
         if user.status == UserStatus.PENDING:
             raise AuthenticationError("Account is pending approval")
 
-        # Verify tenant access if subdomain provided
-        if login_data.tenant_subdomain:
-            # Verify user belongs to this tenant
-            from ..tenants.repository import TenantRepository
-            tenant_repo = TenantRepository()
-            tenant = await tenant_repo.get_by_subdomain(login_data.tenant_subdomain)
-            if not tenant or tenant.id != user.tenant_id:
-                raise AuthenticationError("Access denied to this tenant")
+        # Verify the user belongs to the requested tenant (subdomains are stored lowercase)
+        if login_data.tenant_subdomain and tenant_subdomain != login_data.tenant_subdomain.lower():
+            raise AuthenticationError("Access denied to this tenant")
+
+        # Migrate bcrypt (or weaker Argon2) hashes while the plain password is at hand
+        if jwt_handler.password_needs_rehash(user.password_hash):
+            await self.user_repo.update_password_hash(
+                user.id, await jwt_handler.hash_password_async(login_data.password)
+            )
+
+        # Load the full profile only once the login is known to succeed
+        user = await self.user_repo.get_user_by_id(user.id)
 
         # Create tokens
         access_token = jwt_handler.create_access_token(
             user_id=user.id,
             tenant_id=user.tenant_id,
             email=user.email,
-            role=user.role.value,
+            role=user.role.slug,
             permissions=user.permissions
         )
 
@@ -151,7 +190,9 @@ class AuthService:
         )
 
         # Create session record
-        session_expires = datetime.utcnow() + timedelta(days=7 if login_data.remember_me else 1)
+        session_expires = _utcnow() + (
+            _SESSION_TTL_REMEMBER if login_data.remember_me else _SESSION_TTL_DEFAULT
+        )
         await self._create_session(user, access_token, session_expires)
 
         # Update last login
@@ -184,7 +225,7 @@ class AuthService:
                 user_id=user.id,
                 tenant_id=user.tenant_id,
                 email=user.email,
-                role=user.role.value,
+                role=user.role.slug,
                 permissions=user.permissions
             )
 
@@ -221,18 +262,17 @@ class AuthService:
 
     async def change_password(self, user_id: uuid.UUID, password_data: ChangePasswordRequest) -> bool:
         """Change user password."""
-        user = await self.user_repo.get_user_by_id(user_id)
-        if not user:
-            raise NotFoundError("User", str(user_id))
+        # Only the hash is needed; raises NotFoundError for an unknown user
+        password_hash = await self.user_repo.get_password_hash(user_id)
 
         # Verify current password
-        if not user.password_hash or not jwt_handler.verify_password(
-            password_data.current_password, user.password_hash
+        if not password_hash or not await jwt_handler.verify_password_async(
+            password_data.current_password, password_hash
         ):
             raise AuthenticationError("Current password is incorrect")
 
         # Hash new password
-        new_password_hash = jwt_handler.hash_password(password_data.new_password)
+        new_password_hash = await jwt_handler.hash_password_async(password_data.new_password)
 
         # Update password
         await self.user_repo.update_password(user_id, new_password_hash)
@@ -263,20 +303,15 @@ class AuthService:
         invitation_data: UserInvitationRequest
     ) -> Dict[str, Any]:
         """Send user invitation."""
-        # Check if user already exists
-        existing_user = await self.user_repo.get_user_by_email(invitation_data.email)
-        if existing_user:
-            raise ConflictError(f"User with email '{invitation_data.email}' already exists")
-
         # Generate invitation token
         invitation_token = jwt_handler.generate_invitation_token(
             email=invitation_data.email,
             tenant_id=tenant_id,
-            role=invitation_data.role.value,
+            role=invitation_data.role.slug,
             expires_days=7
         )
 
-        # Store invitation in database
+        # Store invitation in database; raises ConflictError if the user already exists
         invitation = await self.user_repo.create_invitation(
             email=invitation_data.email,
             tenant_id=tenant_id,
@@ -335,35 +370,38 @@ class AuthService:
         await self.user_repo.invalidate_session(user_id, session_token)
 
         # Also remove from Redis cache
-        cache_key = f"session:{session_token}"
-        await self.redis_client.delete(cache_key)
+        await self.redis_client.delete_indexed(f"session:{session_token}", f"user_sessions:{user_id}")
 
     async def _invalidate_all_user_sessions(self, user_id: uuid.UUID) -> None:
         """Invalidate all sessions for a user."""
         await self.user_repo.invalidate_all_sessions(user_id)
 
-        # Also remove from Redis cache (would need to track session keys)
-        pattern = f"session:*:user:{user_id}"
-        await self.redis_client.delete_pattern(pattern)
+        # Also remove from Redis cache via the user's index of cached session keys
+        await self.redis_client.delete_index(f"user_sessions:{user_id}")
 
     async def check_session_validity(self, session_token: str) -> bool:
         """Check if session is still valid."""
         # First check Redis cache
+        # Only the key's presence matters, so skip fetching and decoding the value
         cache_key = f"session:{session_token}"
-        cached_session = await self.redis_client.get(cache_key)
-
-        if cached_session:
+        if await self.redis_client.exists(cache_key):
             return True
 
         # Fallback to database
         session = await self.user_repo.get_session_by_token(session_token)
         if session and session.is_active and not session.is_expired:
-            # Cache the valid session
-            await self.redis_client.setex(
-                cache_key,
-                3600,  # 1 hour cache
-                {"user_id": str(session.user_id), "active": True}
-            )
+            # Cache the valid session; the value is just the owning user's id
+            # as raw bytes. The write is awaited so a logout that follows
+            # cannot be overtaken by it and leave the session cached.
+            try:
+                await self.redis_client.setex_indexed(
+                    cache_key,
+                    3600,  # 1 hour cache
+                    session.user_id.bytes,
+                    f"user_sessions:{session.user_id}"
+                )
+            except Exception as e:
+                logger.warning("Failed to cache session", error=str(e))
             return True
 
         return False
@@ -384,7 +422,7 @@ class AuthService:
         """Reset password using reset token."""
         try:
             user_id = jwt_handler.verify_reset_token(token)
-            password_hash = jwt_handler.hash_password(new_password)
+            password_hash = await jwt_handler.hash_password_async(new_password)
 
             await self.user_repo.update_password(user_id, password_hash)
             await self._invalidate_all_user_sessions(user_id)
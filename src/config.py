@@ -3,11 +3,18 @@ Configuration management for the Requirements Generator application.
 Supports multiple environments with proper validation.
 """
 
+import json
 import os
-from functools import lru_cache
-from typing import Optional, List
-from pydantic import validator, Field
-from pydantic_settings import BaseSettings
+from functools import cached_property, lru_cache
+from typing import Annotated, Optional, List
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+
+# Comma-separated list settings. NoDecode skips the JSON decoding pydantic-settings
+# applies to complex env values so split_csv sees the raw string (and accepts
+# either a JSON array or a comma-separated list).
+CSVList = Annotated[List[str], NoDecode]
+_CSV_FIELDS = ("cors_origins", "cors_methods", "cors_headers", "allowed_extensions", "default_tenant_features")
 
 
 class Settings(BaseSettings):
@@ -33,6 +40,9 @@ class Settings(BaseSettings):
     database_pool_size: int = Field(default=20, env="DATABASE_POOL_SIZE")
     database_max_overflow: int = Field(default=10, env="DATABASE_MAX_OVERFLOW")
     database_echo: bool = Field(default=False, env="DATABASE_ECHO")
+    database_pool_recycle: int = Field(default=1800, env="DATABASE_POOL_RECYCLE")
+    database_pool_prewarm: bool = Field(default=True, env="DATABASE_POOL_PREWARM")
+    database_statement_cache_size: int = Field(default=1024, env="DATABASE_STATEMENT_CACHE_SIZE")
 
     # Redis
     redis_url: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
@@ -45,16 +55,19 @@ class Settings(BaseSettings):
     jwt_secret: str = Field(default="jwt-secret-key-change-in-production", env="JWT_SECRET")
     jwt_algorithm: str = Field(default="HS256", env="JWT_ALGORITHM")
     jwt_expiration_hours: int = Field(default=24, env="JWT_EXPIRATION_HOURS")
+    # New hashes use Argon2id and bcrypt is only ever verified, so this is not
+    # read any more; it stays so existing env files keep loading
     bcrypt_rounds: int = Field(default=12, env="BCRYPT_ROUNDS")
+    password_hash_workers: Optional[int] = Field(default=None, env="PASSWORD_HASH_WORKERS")  # None: one per CPU
 
     # CORS
-    cors_origins: List[str] = Field(
+    cors_origins: CSVList = Field(
         default=["http://localhost:3000", "http://localhost:8000"],
         env="CORS_ORIGINS"
     )
     cors_credentials: bool = Field(default=True, env="CORS_CREDENTIALS")
-    cors_methods: List[str] = Field(default=["*"], env="CORS_METHODS")
-    cors_headers: List[str] = Field(default=["*"], env="CORS_HEADERS")
+    cors_methods: CSVList = Field(default=["*"], env="CORS_METHODS")
+    cors_headers: CSVList = Field(default=["*"], env="CORS_HEADERS")
 
     # AI Integration
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
@@ -83,13 +96,18 @@ class Settings(BaseSettings):
     session_expire_hours: int = Field(default=8, env="SESSION_EXPIRE_HOURS")
     conversation_expire_hours: int = Field(default=4, env="CONVERSATION_EXPIRE_HOURS")
 
+    # In-process caching
+    user_cache_size: int = Field(default=10_000, env="USER_CACHE_SIZE")
+    user_cache_ttl: int = Field(default=60, env="USER_CACHE_TTL")
+    auth_cache_ttl: int = Field(default=5, env="AUTH_CACHE_TTL")
+
     # Rate Limiting
     rate_limit_per_minute: int = Field(default=60, env="RATE_LIMIT_PER_MINUTE")
     ai_rate_limit_per_hour: int = Field(default=100, env="AI_RATE_LIMIT_PER_HOUR")
 
     # File Storage
     upload_max_size: int = Field(default=10 * 1024 * 1024, env="UPLOAD_MAX_SIZE")  # 10MB
-    allowed_extensions: List[str] = Field(
+    allowed_extensions: CSVList = Field(
         default=[".md", ".txt", ".json", ".yaml", ".yml"],
         env="ALLOWED_EXTENSIONS"
     )
@@ -106,47 +124,27 @@ class Settings(BaseSettings):
     metrics_port: int = Field(default=9090, env="METRICS_PORT")
 
     # Multi-tenant settings
-    default_tenant_features: List[str] = Field(
+    default_tenant_features: CSVList = Field(
         default=["ai_assistant", "requirements_management", "basic_collaboration"],
         env="DEFAULT_TENANT_FEATURES"
     )
     max_tenants_per_user: int = Field(default=3, env="MAX_TENANTS_PER_USER")
 
-    @validator("environment")
+    @field_validator("environment")
+    @classmethod
     def validate_environment(cls, v):
         allowed = ["development", "testing", "staging", "production"]
         if v not in allowed:
             raise ValueError(f"Environment must be one of {allowed}")
         return v
 
-    @validator("cors_origins", pre=True)
-    def parse_cors_origins(cls, v):
-        if isinstance(v, str):
-            return [origin.strip() for origin in v.split(",")]
-        return v
-
-    @validator("cors_methods", pre=True)
-    def parse_cors_methods(cls, v):
-        if isinstance(v, str):
-            return [method.strip() for method in v.split(",")]
-        return v
-
-    @validator("cors_headers", pre=True)
-    def parse_cors_headers(cls, v):
+    @field_validator(*_CSV_FIELDS, mode="before")
+    @classmethod
+    def split_csv(cls, v):
         if isinstance(v, str):
-            return [header.strip() for header in v.split(",")]
-        return v
-
-    @validator("allowed_extensions", pre=True)
-    def parse_allowed_extensions(cls, v):
-        if isinstance(v, str):
-            return [ext.strip() for ext in v.split(",")]
-        return v
-
-    @validator("default_tenant_features", pre=True)
-    def parse_default_tenant_features(cls, v):
-        if isinstance(v, str):
-            return [feature.strip() for feature in v.split(",")]
+            if v.startswith("["):
+                return json.loads(v)
+            return [item.strip() for item in v.split(",")]
         return v
 
     @property
@@ -161,15 +159,19 @@ class Settings(BaseSettings):
     def is_testing(self) -> bool:
         return self.environment == "testing"
 
-    @property
+    @cached_property
     def database_url_sync(self) -> str:
         """Synchronous database URL for Alembic migrations."""
         return self.database_url.replace("+asyncpg", "")
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        # Only the profile get_settings() picks is ever instantiated, so build
+        # validators on first use rather than once per class at import
+        defer_build=True,
+    )
 
 
 class DevelopmentSettings(Settings):
@@ -195,7 +197,6 @@ class ProductionSettings(Settings):
     reload: bool = False
     database_echo: bool = False
     log_level: str = "INFO"
-    bcrypt_rounds: int = 14
 
 
 @lru_cache()
@@ -2,8 +2,11 @@
 Development configuration with mock services.
 """
 
-import os
+from functools import cache
+
 from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
 from src.config import Settings
 
 class DevelopmentSettings(Settings):
@@ -12,9 +15,7 @@ class DevelopmentSettings(Settings):
     # Additional development-specific fields
     mock_openai: bool = Field(default=True, env="MOCK_OPENAI")
 
-    class Config:
-        env_file = ".env.dev"
-        env_file_encoding = "utf-8"
+    model_config = SettingsConfigDict(env_file=".env.dev", env_file_encoding="utf-8")
 
     @property
     def use_mock_openai(self) -> bool:
@@ -22,12 +23,14 @@ class DevelopmentSettings(Settings):
         return self.mock_openai
 
 
-# Create development settings with overrides
-dev_settings = DevelopmentSettings(
-    debug=True,
-    openai_api_key="mock-key-for-development",
-    openai_model="gpt-4",
-    mock_openai=True,
-    database_url="sqlite+aiosqlite:///./dev_requirements.db",
-    redis_url="redis://localhost:6379/0"  # Will be ignored if Redis not available
-)
\ No newline at end of file
+@cache
+def get_dev_settings() -> DevelopmentSettings:
+    """Development settings with overrides, built on first use."""
+    return DevelopmentSettings(
+        debug=True,
+        openai_api_key="mock-key-for-development",
+        openai_model="gpt-4",
+        mock_openai=True,
+        database_url="sqlite+aiosqlite:///./dev_requirements.db",
+        redis_url="redis://localhost:6379/0"  # Will be ignored if Redis not available
+    )
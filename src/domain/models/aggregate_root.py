@@ -3,14 +3,15 @@ Aggregate Root domain model.
 Represents an aggregate root in the domain-driven design model.
 """
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Set, Dict, Any
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Set, Dict, Any, Tuple
 import uuid
 from abc import ABC, abstractmethod
 from .domain_entity import DomainEntity
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AggregateRoot:
     """
     Represents an aggregate root in DDD.
@@ -22,12 +23,22 @@ class AggregateRoot:
     aggregate_id: str
     bounded_context: str
     root_entity: DomainEntity
-    child_entities: List[DomainEntity] = field(default_factory=list)
-    domain_events: List[str] = field(default_factory=list)
-    consistency_rules: List[str] = field(default_factory=list)
+    child_entities: Tuple[DomainEntity, ...] = ()
+    domain_events: Tuple[str, ...] = ()
+    consistency_rules: Tuple[str, ...] = ()
+    # Entities by name, built on the first lookup; never part of equality
+    _entities_by_name: Optional[Dict[str, DomainEntity]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         """Validate the aggregate root."""
+        # Collections are immutable like the aggregate itself; lists are accepted
+        for name in ('child_entities', 'domain_events', 'consistency_rules'):
+            value = getattr(self, name)
+            if type(value) is not tuple:
+                object.__setattr__(self, name, tuple(value))
+
         if not self.name or not self.name.strip():
             raise ValueError("Aggregate root name cannot be empty")
 
@@ -52,65 +63,37 @@ class AggregateRoot:
         if entity.bounded_context != self.bounded_context:
             raise ValueError("Child entity must belong to the same bounded context")
 
-        new_children = self.child_entities.copy()
-        new_children.append(entity)
-
-        return AggregateRoot(
-            name=self.name,
-            aggregate_id=self.aggregate_id,
-            bounded_context=self.bounded_context,
-            root_entity=self.root_entity,
-            child_entities=new_children,
-            domain_events=self.domain_events,
-            consistency_rules=self.consistency_rules
-        )
+        return replace(self, child_entities=self.child_entities + (entity,))
 
     def add_domain_event(self, event: str) -> 'AggregateRoot':
         """Add a domain event to this aggregate."""
-        new_events = self.domain_events.copy()
-        new_events.append(event)
-
-        return AggregateRoot(
-            name=self.name,
-            aggregate_id=self.aggregate_id,
-            bounded_context=self.bounded_context,
-            root_entity=self.root_entity,
-            child_entities=self.child_entities,
-            domain_events=new_events,
-            consistency_rules=self.consistency_rules
-        )
+        return replace(self, domain_events=self.domain_events + (event,))
 
     def add_consistency_rule(self, rule: str) -> 'AggregateRoot':
         """Add a consistency rule to this aggregate."""
-        new_rules = self.consistency_rules.copy()
-        new_rules.append(rule)
+        return replace(self, consistency_rules=self.consistency_rules + (rule,))
 
-        return AggregateRoot(
-            name=self.name,
-            aggregate_id=self.aggregate_id,
-            bounded_context=self.bounded_context,
-            root_entity=self.root_entity,
-            child_entities=self.child_entities,
-            domain_events=self.domain_events,
-            consistency_rules=new_rules
-        )
-
-    def get_all_entities(self) -> List[DomainEntity]:
+    def get_all_entities(self) -> Tuple[DomainEntity, ...]:
         """Get all entities in this aggregate (root + children)."""
-        return [self.root_entity] + self.child_entities
+        return (self.root_entity, *self.child_entities)
+
+    def _entity_index(self) -> Dict[str, DomainEntity]:
+        index = self._entities_by_name
+        if index is None:
+            # The first entity with a name wins, as a front-to-back scan would find it
+            index = {}
+            for entity in self.get_all_entities():
+                index.setdefault(entity.name, entity)
+            object.__setattr__(self, '_entities_by_name', index)
+        return index
 
     def has_entity(self, entity_name: str) -> bool:
         """Check if this aggregate contains an entity with the given name."""
-        all_entities = self.get_all_entities()
-        return any(entity.name == entity_name for entity in all_entities)
+        return entity_name in self._entity_index()
 
     def get_entity_by_name(self, entity_name: str) -> Optional[DomainEntity]:
         """Get an entity by name from this aggregate."""
-        all_entities = self.get_all_entities()
-        for entity in all_entities:
-            if entity.name == entity_name:
-                return entity
-        return None
+        return self._entity_index().get(entity_name)
 
     def __str__(self) -> str:
         return f"AggregateRoot({self.name}:{self.aggregate_id})"
@@ -184,10 +167,11 @@ class AggregateConsistencyValidator:
                     f"{aggregate.bounded_context}"
                 )
 
-        # Check for duplicate entity names within the aggregate
+        # Check for duplicate entity names within the aggregate; the set
+        # comparison settles the usual all-unique case without counting
         entity_names = [entity.name for entity in all_entities]
-        duplicates = set([name for name in entity_names if entity_names.count(name) > 1])
-        if duplicates:
+        if len(set(entity_names)) != len(entity_names):
+            duplicates = {name for name, count in Counter(entity_names).items() if count > 1}
             errors.append(f"Duplicate entity names found: {duplicates}")
 
         return errors
\ No newline at end of file
@@ -3,13 +3,13 @@ Bounded Context domain model.
 Represents a bounded context in the domain-driven design model.
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Set
+from dataclasses import dataclass, replace
+from typing import FrozenSet, List, Optional
 import uuid
 from datetime import datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BoundedContext:
     """
     Represents a bounded context in DDD.
@@ -18,62 +18,33 @@ class BoundedContext:
 
     name: str
     description: Optional[str] = None
-    ubiquitous_language: Optional[Set[str]] = None
-    domain_entities: Optional[Set[str]] = None
-    aggregate_roots: Optional[Set[str]] = None
+    ubiquitous_language: FrozenSet[str] = frozenset()
+    domain_entities: FrozenSet[str] = frozenset()
+    aggregate_roots: FrozenSet[str] = frozenset()
 
     def __post_init__(self):
         """Validate the bounded context."""
         if not self.name or not self.name.strip():
             raise ValueError("Bounded context name cannot be empty")
 
-        if self.ubiquitous_language is None:
-            object.__setattr__(self, 'ubiquitous_language', set())
-
-        if self.domain_entities is None:
-            object.__setattr__(self, 'domain_entities', set())
-
-        if self.aggregate_roots is None:
-            object.__setattr__(self, 'aggregate_roots', set())
+        # Collections are immutable like the context itself; plain sets are
+        # accepted, and None still means empty
+        for name in ('ubiquitous_language', 'domain_entities', 'aggregate_roots'):
+            value = getattr(self, name)
+            if type(value) is not frozenset:
+                object.__setattr__(self, name, frozenset(value) if value is not None else frozenset())
 
     def add_domain_entity(self, entity_name: str) -> 'BoundedContext':
         """Add a domain entity to this bounded context."""
-        new_entities = self.domain_entities.copy()
-        new_entities.add(entity_name)
-
-        return BoundedContext(
-            name=self.name,
-            description=self.description,
-            ubiquitous_language=self.ubiquitous_language,
-            domain_entities=new_entities,
-            aggregate_roots=self.aggregate_roots
-        )
+        return replace(self, domain_entities=self.domain_entities | {entity_name})
 
     def add_aggregate_root(self, aggregate_name: str) -> 'BoundedContext':
         """Add an aggregate root to this bounded context."""
-        new_aggregates = self.aggregate_roots.copy()
-        new_aggregates.add(aggregate_name)
-
-        return BoundedContext(
-            name=self.name,
-            description=self.description,
-            ubiquitous_language=self.ubiquitous_language,
-            domain_entities=self.domain_entities,
-            aggregate_roots=new_aggregates
-        )
+        return replace(self, aggregate_roots=self.aggregate_roots | {aggregate_name})
 
     def add_to_ubiquitous_language(self, term: str) -> 'BoundedContext':
         """Add a term to the ubiquitous language."""
-        new_language = self.ubiquitous_language.copy()
-        new_language.add(term)
-
-        return BoundedContext(
-            name=self.name,
-            description=self.description,
-            ubiquitous_language=new_language,
-            domain_entities=self.domain_entities,
-            aggregate_roots=self.aggregate_roots
-        )
+        return replace(self, ubiquitous_language=self.ubiquitous_language | {term})
 
     def contains_entity(self, entity_name: str) -> bool:
         """Check if this bounded context contains a specific domain entity."""
@@ -3,13 +3,31 @@ Domain Entity model.
 Represents a domain entity in the domain-driven design model.
 """
 
-from dataclasses import dataclass
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass, replace
+from typing import Dict, Any, List, Tuple
+import re
 import uuid
 from abc import ABC, abstractmethod
 
 
-@dataclass(frozen=True)
+# Canonical hyphenated UUID, the form entity IDs are generated in
+_UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)
+
+
+def _is_uuid(value: str) -> bool:
+    """Check whether a string is a valid UUID."""
+    if _UUID_RE.fullmatch(value):
+        return True
+
+    # Any other form uuid.UUID accepts, such as braces or a urn: prefix
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+@dataclass(frozen=True, slots=True)
 class DomainEntity:
     """
     Represents a domain entity in DDD.
@@ -21,8 +39,8 @@ class DomainEntity:
     entity_id: str
     bounded_context: str
     attributes: Dict[str, Any]
-    business_rules: Optional[List[str]] = None
-    invariants: Optional[List[str]] = None
+    business_rules: Tuple[str, ...] = ()
+    invariants: Tuple[str, ...] = ()
 
     def __post_init__(self):
         """Validate the domain entity."""
@@ -35,11 +53,12 @@ class DomainEntity:
         if not self.bounded_context or not self.bounded_context.strip():
             raise ValueError("Bounded context cannot be empty")
 
-        if self.business_rules is None:
-            object.__setattr__(self, 'business_rules', [])
-
-        if self.invariants is None:
-            object.__setattr__(self, 'invariants', [])
+        # Rule collections are immutable like the entity itself; lists are
+        # accepted, and None still means empty
+        for name in ('business_rules', 'invariants'):
+            value = getattr(self, name)
+            if type(value) is not tuple:
+                object.__setattr__(self, name, tuple(value) if value is not None else ())
 
     def has_attribute(self, attribute_name: str) -> bool:
         """Check if the entity has a specific attribute."""
@@ -51,45 +70,15 @@ class DomainEntity:
 
     def add_business_rule(self, rule: str) -> 'DomainEntity':
         """Add a business rule to this entity."""
-        new_rules = self.business_rules.copy()
-        new_rules.append(rule)
-
-        return DomainEntity(
-            name=self.name,
-            entity_id=self.entity_id,
-            bounded_context=self.bounded_context,
-            attributes=self.attributes,
-            business_rules=new_rules,
-            invariants=self.invariants
-        )
+        return replace(self, business_rules=self.business_rules + (rule,))
 
     def add_invariant(self, invariant: str) -> 'DomainEntity':
         """Add an invariant to this entity."""
-        new_invariants = self.invariants.copy()
-        new_invariants.append(invariant)
-
-        return DomainEntity(
-            name=self.name,
-            entity_id=self.entity_id,
-            bounded_context=self.bounded_context,
-            attributes=self.attributes,
-            business_rules=self.business_rules,
-            invariants=new_invariants
-        )
+        return replace(self, invariants=self.invariants + (invariant,))
 
     def with_attributes(self, **new_attributes) -> 'DomainEntity':
         """Create a new entity with updated attributes."""
-        updated_attributes = self.attributes.copy()
-        updated_attributes.update(new_attributes)
-
-        return DomainEntity(
-            name=self.name,
-            entity_id=self.entity_id,
-            bounded_context=self.bounded_context,
-            attributes=updated_attributes,
-            business_rules=self.business_rules,
-            invariants=self.invariants
-        )
+        return replace(self, attributes={**self.attributes, **new_attributes})
 
     def __str__(self) -> str:
         return f"DomainEntity({self.name}:{self.entity_id})"
@@ -131,9 +120,7 @@ class DefaultDomainEntityValidator(DomainEntityValidator):
             errors.append("Bounded context cannot be empty")
 
         # Validate that entity ID is a valid format
-        try:
-            uuid.UUID(entity.entity_id)
-        except ValueError:
+        if not _is_uuid(entity.entity_id):
             errors.append("Entity ID must be a valid UUID")
 
         return errors
\ No newline at end of file
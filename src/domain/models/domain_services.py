@@ -3,8 +3,11 @@ Domain Services for business logic that doesn't naturally fit within entities or
 Domain services contain business logic that operates on multiple entities or aggregates.
 """
 
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple, FrozenSet
 import uuid
+from bisect import bisect_right
+from functools import lru_cache
+from operator import itemgetter
 from abc import ABC, abstractmethod
 from .bounded_context import BoundedContext
 from .domain_entity import DomainEntity
@@ -12,6 +15,70 @@ from .aggregate_root import AggregateRoot
 from .value_objects import Priority, ComplexityLevel, BusinessValue, StoryPoints, ComplexityScale
 
 
+# Known relationships between bounded contexts. Simple heuristic - can be made more sophisticated
+_CONTEXT_RELATIONSHIPS = (
+    ('User Management', 'Authentication'),
+    ('Order Processing', 'Payment'),
+    ('Inventory', 'Product Catalog'),
+    ('Reporting', 'Analytics')
+)
+
+# Relationships hold both ways, so both orderings are stored for a single lookup
+_KNOWN_CONTEXT_RELATIONSHIPS = frozenset(
+    _CONTEXT_RELATIONSHIPS + tuple((second, first) for first, second in _CONTEXT_RELATIONSHIPS)
+)
+
+# Each context's related contexts
+_RELATED_CONTEXTS: Dict[str, Set[str]] = {}
+for _first, _second in _KNOWN_CONTEXT_RELATIONSHIPS:
+    _RELATED_CONTEXTS.setdefault(_first, set()).add(_second)
+del _first, _second
+
+# Lower bounds of the average complexity for each scale above TRIVIAL
+_COMPLEXITY_THRESHOLDS = (1.5, 2.5, 3.5, 4.5)
+_COMPLEXITY_SCALES = (
+    ComplexityScale.TRIVIAL,
+    ComplexityScale.SIMPLE,
+    ComplexityScale.MODERATE,
+    ComplexityScale.COMPLEX,
+    ComplexityScale.VERY_COMPLEX
+)
+
+
+# Numeric weight of each priority level
+_PRIORITY_WEIGHTS = {
+    'critical': 2.0,
+    'high': 1.5,
+    'medium': 1.0,
+    'low': 0.7,
+    'nice_to_have': 0.5
+}
+
+
+@lru_cache(maxsize=16)
+def _priority_weight(priority: str) -> float:
+    """Get numeric weight for priority level, cached as only a handful of levels exist."""
+    return _PRIORITY_WEIGHTS.get(priority.lower(), 1.0)
+
+
+# Words that hint at an entity attribute
+_ATTRIBUTE_KEYWORDS = frozenset({
+    'name', 'title', 'description', 'status', 'type', 'date',
+    'time', 'amount', 'quantity', 'price', 'value', 'id',
+    'identifier', 'code', 'reference', 'number'
+})
+
+# Common business domain terms
+_DOMAIN_KEYWORDS = frozenset({
+    'user', 'customer', 'order', 'product', 'account', 'payment',
+    'invoice', 'subscription', 'profile', 'preferences', 'settings',
+    'notification', 'report', 'dashboard', 'analytics', 'metric'
+})
+
+# Removes punctuation from text in one pass, ahead of splitting it into words
+_PUNCTUATION_TABLE = str.maketrans('', '', '.,!?()[]{}":;')
+
+
 class RequirementDomainService:
     """
     Domain service for requirement-related business logic.
@@ -31,10 +98,8 @@ class RequirementDomainService:
         total_story_points = 0
 
         for req in requirements:
-            complexity_value = req.get('complexity', 1)
             story_points = req.get('story_points', 1)
-
-            total_weighted_complexity += complexity_value * story_points
+            total_weighted_complexity += req.get('complexity', 1) * story_points
             total_story_points += story_points
 
         if total_story_points == 0:
@@ -43,61 +108,49 @@ class RequirementDomainService:
         average_complexity = total_weighted_complexity / total_story_points
 
         # Map to complexity scale
-        if average_complexity >= 4.5:
-            return ComplexityLevel(ComplexityScale.VERY_COMPLEX)
-        elif average_complexity >= 3.5:
-            return ComplexityLevel(ComplexityScale.COMPLEX)
-        elif average_complexity >= 2.5:
-            return ComplexityLevel(ComplexityScale.MODERATE)
-        elif average_complexity >= 1.5:
-            return ComplexityLevel(ComplexityScale.SIMPLE)
-        else:
-            return ComplexityLevel(ComplexityScale.TRIVIAL)
+        return ComplexityLevel(
+            _COMPLEXITY_SCALES[bisect_right(_COMPLEXITY_THRESHOLDS, average_complexity)]
+        )
 
     def identify_requirement_dependencies(
         self,
         requirements: List[Dict[str, Any]]
     ) -> Dict[str, List[str]]:
         """Identify potential dependencies between requirements."""
+        # Index requirement positions by entity and by context once, so each
+        # requirement only visits the requirements it shares something with
+        # instead of comparing against every other requirement
+        entity_index: Dict[str, List[int]] = {}
+        context_index: Dict[str, List[int]] = {}
+        for position, req in enumerate(requirements):
+            for entity in set(req.get('domain_entities', [])):
+                entity_index.setdefault(entity, []).append(position)
+            context_index.setdefault(req.get('bounded_context', ''), []).append(position)
+
         dependencies = {}
 
         for req in requirements:
             req_id = req.get('id', '')
-            dependencies[req_id] = []
 
-            # Analyze dependencies based on domain entities and bounded contexts
-            req_entities = set(req.get('domain_entities', []))
-            req_context = req.get('bounded_context', '')
+            # Requirements sharing an entity, or in a related bounded context
+            related = set()
+            for entity in req.get('domain_entities', []):
+                related.update(entity_index[entity])
+            for context in _RELATED_CONTEXTS.get(req.get('bounded_context', ''), ()):
+                related.update(context_index.get(context, ()))
 
-            for other_req in requirements:
-                if other_req.get('id') == req_id:
-                    continue
-
-                other_entities = set(other_req.get('domain_entities', []))
-                other_context = other_req.get('bounded_context', '')
-
-                # Check for entity overlap
-                if req_entities.intersection(other_entities):
-                    dependencies[req_id].append(other_req.get('id', ''))
-
-                # Check for context relationships
-                elif self._are_contexts_related(req_context, other_context):
-                    dependencies[req_id].append(other_req.get('id', ''))
+            # Listed in requirement order, as a pairwise scan would find them
+            dependencies[req_id] = [
+                requirements[position].get('id', '')
+                for position in sorted(related)
+                if requirements[position].get('id') != req_id
+            ]
 
         return dependencies
 
     def _are_contexts_related(self, context1: str, context2: str) -> bool:
         """Determine if two bounded contexts are related."""
-        # Simple heuristic - can be made more sophisticated
-        known_relationships = {
-            ('User Management', 'Authentication'),
-            ('Order Processing', 'Payment'),
-            ('Inventory', 'Product Catalog'),
-            ('Reporting', 'Analytics')
-        }
-
-        return (context1, context2) in known_relationships or \
-               (context2, context1) in known_relationships
+        return (context1, context2) in _KNOWN_CONTEXT_RELATIONSHIPS
 
     def prioritize_requirements(
         self,
@@ -110,7 +163,7 @@ class RequirementDomainService:
             req['priority_score'] = priority_score
 
         # Sort by priority score (higher first)
-        return sorted(requirements, key=lambda x: x.get('priority_score', 0), reverse=True)
+        return sorted(requirements, key=itemgetter('priority_score'), reverse=True)
 
     def _calculate_priority_score(self, requirement: Dict[str, Any]) -> float:
         """Calculate a priority score for a requirement."""
@@ -126,14 +179,7 @@ class RequirementDomainService:
 
     def _get_priority_weight(self, priority: str) -> float:
         """Get numeric weight for priority level."""
-        weights = {
-            'critical': 2.0,
-            'high': 1.5,
-            'medium': 1.0,
-            'low': 0.7,
-            'nice_to_have': 0.5
-        }
-        return weights.get(priority.lower(), 1.0)
+        return _priority_weight(priority)
 
 
 class ProjectDomainService:
@@ -147,113 +193,105 @@ class ProjectDomainService:
         requirements: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Analyze requirements to extract domain model insights."""
-        bounded_contexts = self._extract_bounded_contexts(requirements)
-        domain_entities = self._extract_domain_entities(requirements)
-        aggregate_roots = self._identify_aggregate_roots(requirements, domain_entities)
+        bounded_contexts, domain_entities, aggregate_roots, ubiquitous_language = (
+            self._collect_domain_model(requirements)
+        )
 
         return {
             'bounded_contexts': bounded_contexts,
             'domain_entities': domain_entities,
             'aggregate_roots': aggregate_roots,
             'context_map': self._build_context_map(bounded_contexts, requirements),
-            'ubiquitous_language': self._extract_ubiquitous_language(requirements)
+            'ubiquitous_language': ubiquitous_language
         }
 
-    def _extract_bounded_contexts(
+    def _collect_domain_model(
         self,
         requirements: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Extract bounded contexts from requirements."""
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], List[str]]:
+        """Extract bounded contexts, domain entities, aggregate roots and the
+        ubiquitous language in a single pass over the requirements."""
         contexts = {}
+        entities = {}
+        aggregates = {}
+        texts = []
 
         for req in requirements:
+            req_id = req.get('id')
             context_name = req.get('bounded_context')
+            entity_name = req.get('domain_entity')
+            aggregate_name = req.get('aggregate_root')
+            description = req.get('description', '')
+
             if context_name:
-                if context_name not in contexts:
-                    contexts[context_name] = {
+                context = contexts.get(context_name)
+                if context is None:
+                    context = contexts[context_name] = {
                         'name': context_name,
                         'requirements': [],
                         'entities': set(),
                         'aggregates': set()
                     }
 
-                contexts[context_name]['requirements'].append(req.get('id'))
+                context['requirements'].append(req_id)
 
-                if req.get('domain_entity'):
-                    contexts[context_name]['entities'].add(req.get('domain_entity'))
+                if entity_name:
+                    context['entities'].add(entity_name)
 
-                if req.get('aggregate_root'):
-                    contexts[context_name]['aggregates'].add(req.get('aggregate_root'))
+                if aggregate_name:
+                    context['aggregates'].add(aggregate_name)
 
-        # Convert sets to lists for JSON serialization
-        for context in contexts.values():
-            context['entities'] = list(context['entities'])
-            context['aggregates'] = list(context['aggregates'])
-
-        return list(contexts.values())
-
-    def _extract_domain_entities(
-        self,
-        requirements: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Extract domain entities from requirements."""
-        entities = {}
-
-        for req in requirements:
-            entity_name = req.get('domain_entity')
             if entity_name:
-                if entity_name not in entities:
-                    entities[entity_name] = {
+                entity = entities.get(entity_name)
+                if entity is None:
+                    entity = entities[entity_name] = {
                         'name': entity_name,
-                        'bounded_context': req.get('bounded_context'),
+                        'bounded_context': context_name,
                         'requirements': [],
                         'attributes': set(),
                         'business_rules': set()
                     }
 
-                entities[entity_name]['requirements'].append(req.get('id'))
+                entity['requirements'].append(req_id)
 
                 # Extract potential attributes from requirement description
-                description = req.get('description', '').lower()
-                potential_attributes = self._extract_attributes_from_text(description)
-                entities[entity_name]['attributes'].update(potential_attributes)
-
-        # Convert sets to lists for JSON serialization
-        for entity in entities.values():
-            entity['attributes'] = list(entity['attributes'])
-            entity['business_rules'] = list(entity['business_rules'])
-
-        return list(entities.values())
+                entity['attributes'].update(self._extract_attributes_from_text(description))
 
-    def _identify_aggregate_roots(
-        self,
-        requirements: List[Dict[str, Any]],
-        domain_entities: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Identify potential aggregate roots."""
-        aggregates = {}
-
-        for req in requirements:
-            aggregate_name = req.get('aggregate_root')
             if aggregate_name:
-                if aggregate_name not in aggregates:
-                    aggregates[aggregate_name] = {
+                aggregate = aggregates.get(aggregate_name)
+                if aggregate is None:
+                    aggregate = aggregates[aggregate_name] = {
                         'name': aggregate_name,
-                        'bounded_context': req.get('bounded_context'),
-                        'root_entity': req.get('domain_entity'),
+                        'bounded_context': context_name,
+                        'root_entity': entity_name,
                         'requirements': [],
                         'child_entities': set(),
                         'domain_events': set()
                     }
 
-                aggregates[aggregate_name]['requirements'].append(req.get('id'))
+                aggregate['requirements'].append(req_id)
+
+            # Domain-specific terms come from titles and descriptions
+            texts.append(req.get('title', ''))
+            texts.append(description)
 
         # Convert sets to lists for JSON serialization
+        for context in contexts.values():
+            context['entities'] = list(context['entities'])
+            context['aggregates'] = list(context['aggregates'])
+
+        for entity in entities.values():
+            entity['attributes'] = list(entity['attributes'])
+            entity['business_rules'] = list(entity['business_rules'])
+
         for aggregate in aggregates.values():
             aggregate['child_entities'] = list(aggregate['child_entities'])
             aggregate['domain_events'] = list(aggregate['domain_events'])
 
-        return list(aggregates.values())
+        # Simple extraction - can be made more sophisticated with NLP
+        terms = self._extract_domain_terms(' '.join(texts))
+
+        return list(contexts.values()), list(entities.values()), list(aggregates.values()), sorted(terms)
 
     def _build_context_map(
         self,
@@ -261,80 +299,40 @@ class ProjectDomainService:
         requirements: List[Dict[str, Any]]
     ) -> Dict[str, List[str]]:
         """Build a context map showing relationships between bounded contexts."""
+        # Index requirements by bounded context, and bounded contexts by
+        # requirement id, so dependencies resolve without rescanning the list
+        requirements_by_context: Dict[Any, List[Dict[str, Any]]] = {}
+        contexts_by_id: Dict[Any, List[Any]] = {}
+        for req in requirements:
+            context_name = req.get('bounded_context')
+            requirements_by_context.setdefault(context_name, []).append(req)
+            contexts_by_id.setdefault(req.get('id'), []).append(context_name)
+
         context_map = {}
 
         for context in bounded_contexts:
             context_name = context['name']
-            context_map[context_name] = []
+            # Insertion-ordered set of the related contexts
+            related_contexts = {}
 
             # Find related contexts based on requirement dependencies
-            for req in requirements:
-                if req.get('bounded_context') == context_name:
-                    depends_on = req.get('depends_on', [])
-
-                    for dep_id in depends_on:
-                        # Find the bounded context of the dependency
-                        for other_req in requirements:
-                            if other_req.get('id') == dep_id:
-                                other_context = other_req.get('bounded_context')
-                                if other_context and other_context != context_name:
-                                    if other_context not in context_map[context_name]:
-                                        context_map[context_name].append(other_context)
-
-        return context_map
-
-    def _extract_ubiquitous_language(
-        self,
-        requirements: List[Dict[str, Any]]
-    ) -> List[str]:
-        """Extract terms for the ubiquitous language."""
-        terms = set()
-
-        for req in requirements:
-            # Extract domain-specific terms from titles and descriptions
-            title = req.get('title', '').lower()
-            description = req.get('description', '').lower()
+            for req in requirements_by_context.get(context_name, ()):
+                for dep_id in req.get('depends_on', []):
+                    # Find the bounded context of the dependency
+                    for other_context in contexts_by_id.get(dep_id, ()):
+                        if other_context and other_context != context_name:
+                            related_contexts[other_context] = None
 
-            # Simple extraction - can be made more sophisticated with NLP
-            domain_terms = self._extract_domain_terms(title + ' ' + description)
-            terms.update(domain_terms)
+            context_map[context_name] = list(related_contexts)
 
-        return sorted(list(terms))
+        return context_map
 
-    def _extract_attributes_from_text(self, text: str) -> Set[str]:
+    def _extract_attributes_from_text(self, text: str) -> FrozenSet[str]:
         """Extract potential entity attributes from text."""
         # Simple pattern matching - can be enhanced with NLP
-        attribute_keywords = [
-            'name', 'title', 'description', 'status', 'type', 'date',
-            'time', 'amount', 'quantity', 'price', 'value', 'id',
-            'identifier', 'code', 'reference', 'number'
-        ]
-
-        attributes = set()
-        words = text.split()
-
-        for word in words:
-            if word.lower() in attribute_keywords:
-                attributes.add(word.lower())
-
-        return attributes
+        return _ATTRIBUTE_KEYWORDS.intersection(text.lower().split())
 
-    def _extract_domain_terms(self, text: str) -> Set[str]:
+    def _extract_domain_terms(self, text: str) -> FrozenSet[str]:
         """Extract domain-specific terms from text."""
         # Simple extraction - in practice, this would use NLP techniques
-        business_terms = set()
-        words = text.split()
-
-        # Common business domain terms
-        domain_keywords = [
-            'user', 'customer', 'order', 'product', 'account', 'payment',
-            'invoice', 'subscription', 'profile', 'preferences', 'settings',
-            'notification', 'report', 'dashboard', 'analytics', 'metric'
-        ]
-
-        for word in words:
-            clean_word = word.lower().strip('.,!?()[]{}":;')
-            if clean_word in domain_keywords and len(clean_word) > 2:
-                business_terms.add(clean_word)
-
-        return business_terms
\ No newline at end of file
+        return _DOMAIN_KEYWORDS.intersection(text.translate(_PUNCTUATION_TABLE).lower().split())
@@ -3,8 +3,9 @@ Value Objects for the requirements domain.
 Value objects are immutable objects that represent concepts in the domain.
 """
 
-from dataclasses import dataclass
-from typing import Union, Optional
+from dataclasses import dataclass, field
+from typing import Union, Optional, Tuple
+import re
 import uuid
 from enum import Enum
 
@@ -27,105 +28,145 @@ class ComplexityScale(Enum):
     VERY_COMPLEX = "very_complex"
 
 
-@dataclass(frozen=True)
+class ValueCategory(Enum):
+    """Business value categories for requirements."""
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+
+# Numeric representation of each priority level (higher = more important)
+_PRIORITY_VALUES = {
+    PriorityLevel.CRITICAL: 5,
+    PriorityLevel.HIGH: 4,
+    PriorityLevel.MEDIUM: 3,
+    PriorityLevel.LOW: 2,
+    PriorityLevel.NICE_TO_HAVE: 1
+}
+
+# Numeric representation of each complexity scale (higher = more complex)
+_COMPLEXITY_VALUES = {
+    ComplexityScale.TRIVIAL: 1,
+    ComplexityScale.SIMPLE: 2,
+    ComplexityScale.MODERATE: 3,
+    ComplexityScale.COMPLEX: 4,
+    ComplexityScale.VERY_COMPLEX: 5
+}
+
+# PREFIX-NUMBER[.VERSION] with a single hyphen; the version is everything
+# after the first dot
+_IDENTIFIER_RE = re.compile(r'([^-]*)-([^-.]*)(?:\.([^-]*))?')
+
+
+@dataclass(frozen=True, slots=True)
 class Priority:
     """Value object representing requirement priority."""
 
     level: PriorityLevel
     reason: Optional[str] = None
+    # Derived from the level once; never part of equality
+    _numeric_value: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate priority."""
-        if not isinstance(self.level, PriorityLevel):
+        if type(self.level) is not PriorityLevel:
             raise ValueError("Priority level must be a PriorityLevel enum")
 
+        object.__setattr__(self, '_numeric_value', _PRIORITY_VALUES[self.level])
+
     @property
     def numeric_value(self) -> int:
         """Get numeric representation of priority (higher = more important)."""
-        priority_values = {
-            PriorityLevel.CRITICAL: 5,
-            PriorityLevel.HIGH: 4,
-            PriorityLevel.MEDIUM: 3,
-            PriorityLevel.LOW: 2,
-            PriorityLevel.NICE_TO_HAVE: 1
-        }
-        return priority_values[self.level]
+        return self._numeric_value
 
     def is_higher_than(self, other: 'Priority') -> bool:
         """Check if this priority is higher than another."""
-        return self.numeric_value > other.numeric_value
+        return self._numeric_value > other._numeric_value
 
     def __str__(self) -> str:
         return f"Priority({self.level.value})"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ComplexityLevel:
     """Value object representing requirement complexity."""
 
     scale: ComplexityScale
     explanation: Optional[str] = None
+    # Derived from the scale once; never part of equality
+    _numeric_value: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate complexity level."""
-        if not isinstance(self.scale, ComplexityScale):
+        if type(self.scale) is not ComplexityScale:
             raise ValueError("Complexity scale must be a ComplexityScale enum")
 
+        object.__setattr__(self, '_numeric_value', _COMPLEXITY_VALUES[self.scale])
+
     @property
     def numeric_value(self) -> int:
         """Get numeric representation of complexity (higher = more complex)."""
-        complexity_values = {
-            ComplexityScale.TRIVIAL: 1,
-            ComplexityScale.SIMPLE: 2,
-            ComplexityScale.MODERATE: 3,
-            ComplexityScale.COMPLEX: 4,
-            ComplexityScale.VERY_COMPLEX: 5
-        }
-        return complexity_values[self.scale]
+        return self._numeric_value
 
     def is_more_complex_than(self, other: 'ComplexityLevel') -> bool:
         """Check if this complexity is higher than another."""
-        return self.numeric_value > other.numeric_value
+        return self._numeric_value > other._numeric_value
 
     def __str__(self) -> str:
         return f"Complexity({self.scale.value})"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BusinessValue:
     """Value object representing business value of a requirement."""
 
     score: int
     justification: Optional[str] = None
+    # Derived from the score once; never part of equality
+    _category: ValueCategory = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate business value."""
-        if not isinstance(self.score, int):
+        # Exact type checks, so bools are not taken for numbers
+        if type(self.score) is not int:
             raise ValueError("Business value score must be an integer")
 
         if self.score < 0 or self.score > 100:
             raise ValueError("Business value score must be between 0 and 100")
 
+        if self.score >= 70:
+            category = ValueCategory.HIGH
+        elif self.score >= 30:
+            category = ValueCategory.MEDIUM
+        else:
+            category = ValueCategory.LOW
+        object.__setattr__(self, '_category', category)
+
+    @property
+    def category(self) -> ValueCategory:
+        """Get the business value category (high >= 70, medium 30-69, low < 30)."""
+        return self._category
+
     @property
     def is_high_value(self) -> bool:
         """Check if this represents high business value (>= 70)."""
-        return self.score >= 70
+        return self._category is ValueCategory.HIGH
 
     @property
     def is_medium_value(self) -> bool:
         """Check if this represents medium business value (30-69)."""
-        return 30 <= self.score < 70
+        return self._category is ValueCategory.MEDIUM
 
     @property
     def is_low_value(self) -> bool:
         """Check if this represents low business value (< 30)."""
-        return self.score < 30
+        return self._category is ValueCategory.LOW
 
     def __str__(self) -> str:
         return f"BusinessValue({self.score})"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StoryPoints:
     """Value object representing story points estimation."""
 
@@ -134,17 +175,14 @@ class StoryPoints:
 
     def __post_init__(self):
         """Validate story points."""
-        if not isinstance(self.points, (int, float)):
+        if type(self.points) not in (int, float):
             raise ValueError("Story points must be a number")
 
         if self.points < 0:
             raise ValueError("Story points cannot be negative")
 
-        # Common Fibonacci sequence values for story points
-        valid_points = {0, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89}
-        if self.points not in valid_points:
-            # Allow other values but log a warning concept
-            pass
+        # Estimates usually follow the Fibonacci sequence (0, 0.5, 1, 2, 3, 5,
+        # 8, 13, ...), but any non-negative value is allowed
 
     @property
     def is_large_story(self) -> bool:
@@ -160,31 +198,39 @@ class StoryPoints:
         return f"StoryPoints({self.points})"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RequirementIdentifier:
     """Value object for requirement identifiers."""
 
     prefix: str
     number: int
     version: Optional[str] = None
+    # Formatted once, as identifiers are immutable; never part of equality
+    _full_identifier: str = field(init=False, repr=False, compare=False)
+    # Hash of the identifying fields, computed on first use
+    _hash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate requirement identifier."""
         if not self.prefix or not self.prefix.strip():
             raise ValueError("Requirement prefix cannot be empty")
 
-        if not isinstance(self.number, int) or self.number <= 0:
+        if type(self.number) is not int or self.number <= 0:
             raise ValueError("Requirement number must be a positive integer")
 
         if self.version and not self.version.strip():
             raise ValueError("Version cannot be empty if provided")
 
+        if self.version:
+            full_identifier = f"{self.prefix}-{self.number:04d}.{self.version}"
+        else:
+            full_identifier = f"{self.prefix}-{self.number:04d}"
+        object.__setattr__(self, '_full_identifier', full_identifier)
+
     @property
     def full_identifier(self) -> str:
         """Get the full identifier string."""
-        if self.version:
-            return f"{self.prefix}-{self.number:04d}.{self.version}"
-        return f"{self.prefix}-{self.number:04d}"
+        return self._full_identifier
 
     @classmethod
     def from_string(cls, identifier: str) -> 'RequirementIdentifier':
@@ -192,18 +238,11 @@ class RequirementIdentifier:
         if not identifier or not identifier.strip():
             raise ValueError("Identifier string cannot be empty")
 
-        parts = identifier.split('-')
-        if len(parts) != 2:
+        match = _IDENTIFIER_RE.fullmatch(identifier)
+        if not match:
             raise ValueError("Identifier must be in format PREFIX-NUMBER[.VERSION]")
 
-        prefix = parts[0]
-        number_version = parts[1]
-
-        if '.' in number_version:
-            number_str, version = number_version.split('.', 1)
-        else:
-            number_str = number_version
-            version = None
+        prefix, number_str, version = match.groups()
 
         try:
             number = int(number_str)
@@ -229,10 +268,48 @@ class RequirementIdentifier:
         )
 
     def __str__(self) -> str:
-        return self.full_identifier
+        return self._full_identifier
+
+    def __hash__(self) -> int:
+        # Identifiers serve as lookup keys, so the field hash is kept
+        result = self._hash
+        if result is None:
+            result = hash((self.prefix, self.number, self.version))
+            object.__setattr__(self, '_hash', result)
+        return result
+
+    def __getstate__(self) -> Tuple[str, int, Optional[str]]:
+        # String hashes differ between processes, so the cached hash is not pickled
+        return self.prefix, self.number, self.version
+
+    def __setstate__(self, state: Tuple[str, int, Optional[str]]) -> None:
+        prefix, number, version = state
+        object.__setattr__(self, 'prefix', prefix)
+        object.__setattr__(self, 'number', number)
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, '_hash', None)
+        self.__post_init__()
+
+    # Identifiers order by prefix, then number; the version does not take part,
+    # so the orderings are spelled out rather than derived from equality
 
     def __lt__(self, other: 'RequirementIdentifier') -> bool:
         """Compare identifiers for sorting."""
         if self.prefix != other.prefix:
             return self.prefix < other.prefix
-        return self.number < other.number
\ No newline at end of file
+        return self.number < other.number
+
+    def __le__(self, other: 'RequirementIdentifier') -> bool:
+        if self.prefix != other.prefix:
+            return self.prefix < other.prefix
+        return self.number <= other.number
+
+    def __gt__(self, other: 'RequirementIdentifier') -> bool:
+        if self.prefix != other.prefix:
+            return self.prefix > other.prefix
+        return self.number > other.number
+
+    def __ge__(self, other: 'RequirementIdentifier') -> bool:
+        if self.prefix != other.prefix:
+            return self.prefix > other.prefix
+        return self.number >= other.number
\ No newline at end of file
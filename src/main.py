@@ -27,6 +27,8 @@ from src.shared.middleware import (
 )
 from src.shared.database import init_database, close_database
 from src.shared.redis_client import init_redis, close_redis
+from src.auth.repository import start_login_flusher, stop_login_flusher
+from src.auth.jwt_handler import start_password_hasher, stop_password_hasher
 
 # Configure structured logging
 structlog.configure(
@@ -55,6 +57,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     try:
         await init_database()
         await init_redis()
+        start_login_flusher()
+        start_password_hasher(settings.password_hash_workers)
         logger.info("Application startup completed successfully")
     except Exception as e:
         logger.error("Failed to start application", error=str(e))
@@ -64,6 +68,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Shutdown
     try:
+        await stop_login_flusher()
+        stop_password_hasher()
         await close_database()
         await close_redis()
         logger.info("Application shutdown completed successfully")
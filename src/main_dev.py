@@ -16,7 +16,7 @@ from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 
 # Import configuration
-from src.config_dev import dev_settings
+from src.config_dev import get_dev_settings
 
 # Set environment variable for mock mode
 os.environ["USE_MOCK_OPENAI"] = "true"
@@ -115,6 +115,7 @@ async def root(request: Request):
 @app.get("/health/dev")
 async def dev_health_check():
     """Development health check with enhanced information."""
+    dev_settings = get_dev_settings()
     return {
         "status": "healthy",
         "environment": "development",
@@ -134,7 +135,7 @@ async def dev_health_check():
 @app.get("/mock/openai/status")
 async def mock_openai_status():
     """Check mock OpenAI service status."""
-    if dev_settings.use_mock_openai:
+    if get_dev_settings().use_mock_openai:
         from src.ai.mock_openai_service import get_mock_openai_service
         mock_service = get_mock_openai_service()
         return {
@@ -4,7 +4,8 @@ Provides async SQLAlchemy setup with connection pooling.
 """
 
 import asyncio
-from typing import AsyncGenerator, Optional
+import functools
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional, TypeVar
 
 import structlog
 from sqlalchemy.ext.asyncio import (
@@ -14,10 +15,14 @@ from sqlalchemy.ext.asyncio import (
     AsyncEngine,
 )
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool, QueuePool, StaticPool
-from sqlalchemy import MetaData
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, StaticPool
+from sqlalchemy import JSON, MetaData, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 
 from src.config import settings
+from src.shared.exceptions import DatabaseError
 
 logger = structlog.get_logger(__name__)
 
@@ -40,6 +45,49 @@ class Base(DeclarativeBase):
     )
 
 
+class json_merge(FunctionElement):
+    """
+    Shallow-merge a JSON object into a JSON column on the server, right-hand keys
+    winning. Lets an UPDATE merge without reading the current value first.
+    """
+
+    type = JSON()
+    name = "json_merge"
+    inherit_cache = True
+
+
+@compiles(json_merge, "postgresql")
+def _compile_json_merge_postgresql(element, compiler, **kw):
+    left, right = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"CAST(COALESCE(CAST({left} AS jsonb), '{{}}') || CAST({right} AS jsonb) AS json)"
+
+
+@compiles(json_merge, "sqlite")
+def _compile_json_merge_sqlite(element, compiler, **kw):
+    left, right = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"json_patch(COALESCE({left}, '{{}}'), {right})"
+
+
+_T = TypeVar("_T")
+
+
+def wrap_db_errors(operation: str) -> Callable[[Callable[..., Awaitable[_T]]], Callable[..., Awaitable[_T]]]:
+    """
+    Re-raise SQLAlchemy errors from an async repository method as DatabaseError.
+    Application errors (NotFoundError, ConflictError, ...) and cancellation pass
+    through untouched; the original error is kept as __cause__.
+    """
+    def decorator(method: Callable[..., Awaitable[_T]]) -> Callable[..., Awaitable[_T]]:
+        @functools.wraps(method)
+        async def wrapper(*args: Any, **kwargs: Any) -> _T:
+            try:
+                return await method(*args, **kwargs)
+            except SQLAlchemyError as e:
+                raise DatabaseError(f"Failed to {operation}: {str(e)}") from e
+        return wrapper
+    return decorator
+
+
 async def init_database() -> None:
     """Initialize database connection and engine."""
     global engine, async_session_maker
@@ -61,17 +109,24 @@ async def init_database() -> None:
                 "connect_args": {"check_same_thread": False},
             })
         elif settings.is_testing:
-            # Use NullPool for testing to avoid connection sharing issues
+            # NullPool is for tests only: every checkout pays a full connect
             engine_kwargs["poolclass"] = NullPool
         else:
-            # Use QueuePool for PostgreSQL and other databases
+            # Async engines need the asyncio-aware queue pool; sessions are
+            # request-scoped, so size it for concurrent requests
             engine_kwargs.update({
-                "poolclass": QueuePool,
+                "poolclass": AsyncAdaptedQueuePool,
                 "pool_size": settings.database_pool_size,
                 "max_overflow": settings.database_max_overflow,
-                "pool_recycle": 3600,  # Recycle connections every hour
+                "pool_recycle": settings.database_pool_recycle,
             })
 
+        if "asyncpg" in settings.database_url:
+            # Per-connection prepared statement cache: hot lookups skip the Parse step
+            engine_kwargs["connect_args"] = {
+                "prepared_statement_cache_size": settings.database_statement_cache_size,
+            }
+
         engine = create_async_engine(settings.database_url, **engine_kwargs)
 
         # Create session maker
@@ -84,10 +139,12 @@ async def init_database() -> None:
         )
 
         # Test connection
-        from sqlalchemy import text
         async with engine.begin() as conn:
             await conn.execute(text("SELECT 1"))
 
+        if isinstance(engine.pool, AsyncAdaptedQueuePool) and settings.database_pool_prewarm:
+            await _prewarm_pool(engine, settings.database_pool_size)
+
         logger.info("Database connection initialized successfully")
 
     except Exception as e:
@@ -95,6 +152,24 @@ async def init_database() -> None:
         raise
 
 
+async def _prewarm_pool(engine: AsyncEngine, size: int) -> None:
+    """
+    Open `size` connections at once and return them to the pool, so the first
+    requests after startup don't pay the connect/TLS/auth handshake.
+    """
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(size)),
+        return_exceptions=True,
+    )
+    connections = [result for result in results if not isinstance(result, BaseException)]
+    await asyncio.gather(*(connection.close() for connection in connections))
+
+    if len(connections) < size:
+        logger.warning("Database pool only partially pre-warmed", opened=len(connections), requested=size)
+    else:
+        logger.info("Database pool pre-warmed", connections=size)
+
+
 async def close_database() -> None:
     """Close database connections."""
     global engine
@@ -350,6 +350,30 @@ class RedisClient:
         client = await self._get_client()
         return await RedisManager.delete_pattern(client, pattern)
 
+    async def setex_indexed(self, key: str, ttl: int, value: bytes, index: str) -> None:
+        """Set a raw value with expiration time, unless the key exists, and record it in an index set."""
+        client = await self._get_client()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=ttl, nx=True)
+            pipe.sadd(index, key)
+            # The index outlives every key it holds; stale members are harmless
+            pipe.expire(index, ttl)
+            await pipe.execute()
+
+    async def delete_indexed(self, key: str, index: str) -> None:
+        """Delete a key and drop it from its index set."""
+        client = await self._get_client()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.delete(key)
+            pipe.srem(index, key)
+            await pipe.execute()
+
+    async def delete_index(self, index: str) -> int:
+        """Delete every key recorded in an index set, and the set itself."""
+        client = await self._get_client()
+        keys = await client.smembers(index)
+        return await client.delete(*keys, index) - 1 if keys else 0
+
     async def exists(self, key: str) -> bool:
         """Check if key exists."""
         client = await self._get_client()
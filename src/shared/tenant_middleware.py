@@ -15,9 +15,15 @@ from ..auth.jwt_handler import jwt_handler
 from ..shared.database import get_db_session
 
 
+# Roles allowed through require_admin_role, matched against the token's role claim
+ADMIN_ROLES = frozenset({"tenant_admin", "super_admin"})
+
+
 class TenantContext:
     """Thread-local tenant context for request processing."""
 
+    __slots__ = ("tenant_id", "tenant_subdomain", "user_id", "user_role", "is_authenticated")
+
     def __init__(self):
         self.tenant_id: Optional[uuid.UUID] = None
         self.tenant_subdomain: Optional[str] = None
@@ -229,6 +235,8 @@ class TenantIsolationMiddleware(BaseHTTPMiddleware):
 class RowLevelSecurityMixin:
     """Mixin to add row-level security to repository classes."""
 
+    __slots__ = ()
+
     def _add_tenant_filter(self, query, model_class):
         """Add tenant filter to SQLAlchemy query."""
         if hasattr(model_class, 'tenant_id') and tenant_context.has_tenant:
@@ -312,8 +320,7 @@ def require_admin_role():
                 detail="Authentication required"
             )
 
-        admin_roles = ["tenant_admin", "super_admin"]
-        if tenant_context.user_role not in admin_roles:
+        if tenant_context.user_role not in ADMIN_ROLES:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Administrator access required"
@@ -7,9 +7,9 @@ from datetime import datetime
 from enum import Enum
 from typing import Dict, Any, Optional, List
 
-from sqlalchemy import String, Text, Boolean, DateTime, JSON, ForeignKey, UniqueConstraint
+from sqlalchemy import String, Text, Boolean, DateTime, JSON, ForeignKey, UniqueConstraint, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from sqlalchemy.sql import func
 
 from ..shared.database import Base
@@ -56,7 +56,7 @@ class Tenant(Base):
         default=uuid.uuid4
     )
 
-    # Basic tenant information
+    # Basic tenant information (hostnames are stored lowercased so lookups are exact-match)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     subdomain: Mapped[str] = mapped_column(String(63), unique=True, nullable=False)
     custom_domain: Mapped[Optional[str]] = mapped_column(String(255), unique=True)
@@ -93,12 +93,22 @@ class Tenant(Base):
     technical_contact: Mapped[Optional[str]] = mapped_column(String(255))
 
     # Relationships
-    users: Mapped[List["User"]] = relationship("User", back_populates="tenant")
+    users: Mapped[List["User"]] = relationship("User", back_populates="tenant", passive_deletes=True)
     projects: Mapped[List["Project"]] = relationship("Project", back_populates="tenant")
 
+    __table_args__ = (
+        CheckConstraint('subdomain = lower(subdomain)', name='subdomain_lowercase'),
+        CheckConstraint('custom_domain = lower(custom_domain)', name='custom_domain_lowercase'),
+    )
+
     def __repr__(self) -> str:
         return f"<Tenant(id={self.id}, name='{self.name}', subdomain='{self.subdomain}')>"
 
+    @validates("subdomain", "custom_domain")
+    def _normalize_hostname(self, key: str, value: Optional[str]) -> Optional[str]:
+        """Store hostnames lowercased to keep lookups case-insensitive."""
+        return value.lower() if value else value
+
     @property
     def is_trial_expired(self) -> bool:
         """Check if trial period has expired."""
@@ -103,7 +103,7 @@ class TenantRepository:
         """Get tenant by custom domain."""
         async with await self._get_session() as session:
             try:
-                stmt = select(Tenant).where(Tenant.custom_domain == domain)
+                stmt = select(Tenant).where(Tenant.custom_domain == domain.lower())
                 result = await session.execute(stmt)
                 return result.scalar_one_or_none()
             except Exception as e:
@@ -60,6 +60,12 @@ class TenantBase(BaseModel):
 
         return v
 
+    @validator("custom_domain")
+    @classmethod
+    def normalize_custom_domain(cls, v: Optional[str]) -> Optional[str]:
+        """Lowercase custom domains; hostnames are case-insensitive."""
+        return v.lower() if v else v
+
 
 class TenantCreate(TenantBase):
     """Schema for creating a new tenant."""
@@ -151,6 +157,12 @@ class TenantUpdate(BaseModel):
         description="Tenant-specific settings"
     )
 
+    @validator("custom_domain")
+    @classmethod
+    def normalize_custom_domain(cls, v: Optional[str]) -> Optional[str]:
+        """Lowercase custom domains; hostnames are case-insensitive."""
+        return v.lower() if v else v
+
 
 class TenantResponse(BaseEntity):
     """Schema for tenant API responses."""
@@ -6,13 +6,13 @@ Provides tenant selection and basic dashboard functionality.
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, Request, Depends, HTTPException, status, Form
+from fastapi import APIRouter, Request, HTTPException, status, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 
 from ..shared.tenant_middleware import get_current_tenant, tenant_context
-from ..auth.routes import get_current_user_dependency
-from ..auth.schemas import UserResponse
+from ..auth.routes import AuthServiceDep, CurrentUser
+from ..auth.models import UserRole
 from ..tenants.service import TenantService
 from ..tenants.schemas import TenantResponse
 
@@ -73,7 +73,8 @@ async def dashboard(request: Request):
         "email": "admin@example.com",
         "first_name": "Admin",
         "last_name": "User",
-        "role": "tenant_admin"
+        "role": "tenant_admin",
+        "role_name": "tenant_admin"
     }
 
     return templates.TemplateResponse("pages/dashboard.html", {
@@ -96,6 +97,7 @@ async def login_page(request: Request):
 @web_router.get("/register", response_class=HTMLResponse)
 async def register_page(
     request: Request,
+    auth_service: AuthServiceDep,
     token: Optional[str] = None
 ):
     """Registration page."""
@@ -103,9 +105,7 @@ async def register_page(
 
     # If invitation token provided, verify and show invitation details
     if token:
-        from ..auth.service import AuthService
         try:
-            auth_service = AuthService()
             invitation_data = await auth_service.verify_invitation(token)
         except Exception:
             # Invalid token, continue without invitation data
@@ -122,12 +122,10 @@ async def register_page(
 @web_router.get("/tenant-setup", response_class=HTMLResponse)
 async def tenant_setup_page(
     request: Request,
-    current_user: UserResponse = Depends(get_current_user_dependency)
+    current_user: CurrentUser,
+    auth_service: AuthServiceDep
 ):
     """Tenant setup page for new users."""
-    from ..auth.service import AuthService
-
-    auth_service = AuthService()
     needs_tenant = await auth_service.user_needs_tenant(current_user.id)
 
     if not needs_tenant:
@@ -147,18 +145,17 @@ async def tenant_setup_page(
 @web_router.post("/tenant-setup")
 async def handle_tenant_setup(
     request: Request,
-    current_user: UserResponse = Depends(get_current_user_dependency),
+    current_user: CurrentUser,
+    auth_service: AuthServiceDep,
     organization_name: str = Form(...),
     subdomain: str = Form(...),
     industry: str = Form(...),
     subscription_tier: str = Form(default="trial")
 ):
     """Handle tenant setup form submission."""
-    from ..auth.service import AuthService
     from ..tenants.schemas import TenantCreate
 
     try:
-        auth_service = AuthService()
         tenant_service = TenantService()
 
         # Create tenant
@@ -206,11 +203,11 @@ async def create_tenant_page(request: Request):
 @web_router.get("/admin/users", response_class=HTMLResponse)
 async def admin_users(
     request: Request,
-    current_user: UserResponse = Depends(get_current_user_dependency)
+    current_user: CurrentUser
 ):
     """Admin users management page."""
     # Check admin permissions
-    if current_user.role not in ["tenant_admin", "super_admin"]:
+    if current_user.role < UserRole.TENANT_ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Administrator access required"
@@ -227,11 +224,11 @@ async def admin_users(
 @web_router.get("/admin/tenant", response_class=HTMLResponse)
 async def admin_tenant_settings(
     request: Request,
-    current_user: UserResponse = Depends(get_current_user_dependency)
+    current_user: CurrentUser
 ):
     """Admin tenant settings page."""
     # Check admin permissions
-    if current_user.role not in ["tenant_admin", "super_admin"]:
+    if current_user.role < UserRole.TENANT_ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Administrator access required"
@@ -253,7 +250,7 @@ async def admin_tenant_settings(
 @web_router.get("/profile", response_class=HTMLResponse)
 async def user_profile(
     request: Request,
-    current_user: UserResponse = Depends(get_current_user_dependency)
+    current_user: CurrentUser
 ):
     """User profile page."""
     return templates.TemplateResponse("pages/profile.html", {
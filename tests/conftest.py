@@ -11,6 +11,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 from sqlalchemy.pool import StaticPool
 
 from src.shared.database import Base, get_db_session
+from src.auth.repository import clear_user_caches
+from src.auth.routes import clear_current_user_cache
 from src.config import get_settings
 from tests.test_app import create_test_app
 
@@ -27,6 +29,16 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_user_caches():
+    """Keep cached users from leaking between per-test databases."""
+    clear_user_caches()
+    clear_current_user_cache()
+    yield
+    clear_user_caches()
+    clear_current_user_cache()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_db_engine():
     """Create a test database engine with in-memory SQLite."""
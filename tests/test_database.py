@@ -7,7 +7,7 @@ import uuid
 from datetime import datetime, timedelta
 
 from src.tenants.models import Tenant, TenantFeature, Industry, SubscriptionTier
-from src.auth.models import User, UserRole, UserSession
+from src.auth.models import User, UserRole, UserSession, UserInvitation
 from src.projects.models import Project, Requirement, ProjectMember
 
 
@@ -122,6 +122,7 @@ class TestUserModels:
         assert user.id is not None
         assert user.email == "testuser@example.com"
         assert user.full_name == "Test User"
+        assert user.display_name == "Test User"
         assert user.tenant_id == tenant.id
         assert user.role == UserRole.CONTRIBUTOR
 
@@ -164,6 +165,23 @@ class TestUserModels:
         assert regular_user.has_permission("manage_users") is False
         assert regular_user.has_permission("create_requirements") is True
 
+    def test_user_role_ordering_and_names(self):
+        """Test integer-backed roles compare by level and parse canonical names."""
+        assert UserRole.SUPER_ADMIN > UserRole.TENANT_ADMIN > UserRole.TEAM_LEAD
+        assert UserRole.CONTRIBUTOR > UserRole.READER
+        assert UserRole("tenant_admin") is UserRole.TENANT_ADMIN
+        assert UserRole(1) is UserRole.CONTRIBUTOR
+        assert UserRole.TEAM_LEAD.slug == "team_lead"
+        assert str(UserRole.READER) == "reader"
+
+        user = User(email="role@example.com", first_name="Role", last_name="User", role="contributor")
+        assert user.role is UserRole.CONTRIBUTOR
+
+    def test_user_email_stored_lowercase(self):
+        """Test emails are normalized to lowercase on assignment."""
+        user = User(email="Mixed.Case@Example.COM", first_name="Mixed", last_name="Case")
+        assert user.email == "mixed.case@example.com"
+
     @pytest.mark.asyncio
     async def test_user_session(self, test_db_session, test_helper):
         """Test user session management."""
@@ -189,6 +207,25 @@ class TestUserModels:
         session.extend_session(48)
         assert session.expires_at > old_expiry
 
+    def test_invitation_expiry_derived_from_expires_at(self):
+        """Test invitation validity is computed from expires_at."""
+        invitation = UserInvitation(
+            email="invitee@example.com",
+            token="invite_token_123",
+            is_used=False,
+            expires_at=datetime.utcnow() + timedelta(days=1)
+        )
+        assert invitation.is_expired is False
+        assert invitation.is_valid is True
+
+        invitation.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        assert invitation.is_expired is True
+        assert invitation.is_valid is False
+
+        invitation.expires_at = datetime.utcnow() + timedelta(days=1)
+        invitation.is_used = True
+        assert invitation.is_valid is False
+
 
 class TestProjectModels:
     """Test project-related models."""
@@ -2,14 +2,16 @@
 Tests for enhanced domain models.
 """
 
+import pickle
 import pytest
 import uuid
 from src.domain.models.bounded_context import BoundedContext
 from src.domain.models.domain_entity import DomainEntity, DefaultDomainEntityValidator
 from src.domain.models.aggregate_root import AggregateRoot, DefaultAggregateFactory, AggregateConsistencyValidator
+from src.domain.models.domain_services import RequirementDomainService, ProjectDomainService
 from src.domain.models.value_objects import (
     Priority, PriorityLevel, ComplexityLevel, ComplexityScale,
-    BusinessValue, StoryPoints, RequirementIdentifier
+    BusinessValue, StoryPoints, RequirementIdentifier, ValueCategory
 )
 
 
@@ -45,6 +47,12 @@ class TestBoundedContext:
         assert context.domain_entities == set()
         assert context.aggregate_roots == set()
 
+        explicit = BoundedContext(
+            name="Test Context", ubiquitous_language=None, domain_entities=None, aggregate_roots=None
+        )
+        assert explicit.ubiquitous_language == frozenset()
+        assert explicit.add_domain_entity("User").domain_entities == frozenset({"User"})
+
     def test_add_domain_entity(self):
         """Test adding domain entity to context."""
         context = BoundedContext(name="Test Context")
@@ -112,6 +120,20 @@ class TestDomainEntity:
                 attributes={}
             )
 
+    def test_domain_entity_none_rules_default_empty(self):
+        """Test that None rule collections are treated as empty."""
+        entity = DomainEntity(
+            name="User",
+            entity_id=str(uuid.uuid4()),
+            bounded_context="Test",
+            attributes={},
+            business_rules=None,
+            invariants=None
+        )
+
+        assert entity.business_rules == ()
+        assert entity.add_invariant("Email must be valid format").invariants == ("Email must be valid format",)
+
     def test_add_business_rule(self):
         """Test adding business rule to entity."""
         entity = DomainEntity(
@@ -169,6 +191,26 @@ class TestDomainEntityValidator:
         errors = validator.validate(entity)
         assert any("valid UUID" in error for error in errors)
 
+    def test_domain_entity_validator_accepts_any_uuid_form(self):
+        """Test entity IDs in any form uuid.UUID accepts pass validation."""
+        validator = DefaultDomainEntityValidator()
+        entity_uuid = uuid.uuid4()
+
+        for entity_id in (
+            str(entity_uuid).upper(),
+            entity_uuid.hex,
+            f"{{{entity_uuid}}}",
+            entity_uuid.urn,
+        ):
+            entity = DomainEntity(
+                name="User",
+                entity_id=entity_id,
+                bounded_context="User Management",
+                attributes={}
+            )
+
+            assert validator.validate(entity) == []
+
 
 class TestValueObjects:
     """Test value objects."""
@@ -199,6 +241,16 @@ class TestValueObjects:
         assert value.is_high_value
         assert not value.is_medium_value
         assert not value.is_low_value
+        assert value.category == ValueCategory.HIGH
+
+    def test_business_value_category_boundaries(self):
+        """Test BusinessValue categories split at 30 and 70."""
+        assert BusinessValue(0).category == ValueCategory.LOW
+        assert BusinessValue(29).is_low_value
+        assert BusinessValue(30).is_medium_value
+        assert BusinessValue(69).category == ValueCategory.MEDIUM
+        assert BusinessValue(70).is_high_value
+        assert BusinessValue(100).category == ValueCategory.HIGH
 
     def test_business_value_validation(self):
         """Test BusinessValue validation."""
@@ -209,6 +261,18 @@ class TestValueObjects:
         with pytest.raises(ValueError, match="Business value score must be between 0 and 100"):
             BusinessValue(-10)
 
+        # Booleans are not scores
+        with pytest.raises(ValueError, match="Business value score must be an integer"):
+            BusinessValue(True)
+
+    def test_story_points_reject_non_numbers(self):
+        """Test StoryPoints only accepts ints and floats."""
+        with pytest.raises(ValueError, match="Story points must be a number"):
+            StoryPoints("3")
+
+        with pytest.raises(ValueError, match="Story points must be a number"):
+            StoryPoints(True)
+
     def test_story_points_creation(self):
         """Test creating StoryPoints value object."""
         points = StoryPoints(8, "Planning poker estimation")
@@ -248,6 +312,26 @@ class TestValueObjects:
         assert incremented.number == 6
         assert incremented.prefix == "REQ"
 
+    def test_requirement_identifier_as_key(self):
+        """Test equal identifiers hash alike, so they work as dict keys."""
+        lookup = {RequirementIdentifier("REQ", 1, "v1"): "first"}
+
+        assert lookup[RequirementIdentifier.from_string("REQ-0001.v1")] == "first"
+        assert RequirementIdentifier("REQ", 1) not in lookup
+        assert hash(RequirementIdentifier("REQ", 1)) == hash(RequirementIdentifier("REQ", 1))
+
+    def test_requirement_identifier_pickle_drops_cached_hash(self):
+        """Test pickling leaves the hash to be recomputed by the loading process."""
+        req_id = RequirementIdentifier("REQ", 1, "v1")
+        hash(req_id)
+
+        restored = pickle.loads(pickle.dumps(req_id))
+
+        assert restored._hash is None
+        assert restored == req_id
+        assert str(restored) == "REQ-0001.v1"
+        assert restored in {req_id}
+
     def test_requirement_identifier_comparison(self):
         """Test requirement identifier comparison."""
         req1 = RequirementIdentifier("REQ", 1)
@@ -256,6 +340,12 @@ class TestValueObjects:
 
         assert req1 < req2
         assert req1 < req3  # Different prefix, alphabetical order
+        assert req2 > req1
+        assert req3 >= req2
+        assert req1 <= req1.with_version("v2")
+        assert req1 >= req1.with_version("v2")
+        assert not req1 > req1.with_version("v2")
+        assert sorted([req3, req2, req1]) == [req1, req2, req3]
 
 
 class TestAggregateRoot:
@@ -356,6 +446,42 @@ class TestAggregateRoot:
         assert root_entity in all_entities
         assert child_entity in all_entities
 
+    def test_entity_lookup_by_name(self):
+        """Test name lookups, including on an aggregate derived after a lookup."""
+        root_entity = DomainEntity(
+            name="UserAccount",
+            entity_id=str(uuid.uuid4()),
+            bounded_context="User Management",
+            attributes={}
+        )
+        aggregate = AggregateRoot(
+            name="UserAccount",
+            aggregate_id=str(uuid.uuid4()),
+            bounded_context="User Management",
+            root_entity=root_entity
+        )
+
+        assert aggregate.get_entity_by_name("UserAccount") is root_entity
+        assert not aggregate.has_entity("Profile")
+
+        profile = DomainEntity(
+            name="Profile",
+            entity_id=str(uuid.uuid4()),
+            bounded_context="User Management",
+            attributes={}
+        )
+        extended = aggregate.add_child_entity(profile)
+
+        assert extended.get_entity_by_name("Profile") is profile
+        assert not aggregate.has_entity("Profile")
+        assert extended == AggregateRoot(
+            name=aggregate.name,
+            aggregate_id=aggregate.aggregate_id,
+            bounded_context=aggregate.bounded_context,
+            root_entity=root_entity,
+            child_entities=[profile]
+        )
+
 
 class TestAggregateFactory:
     """Test AggregateFactory."""
@@ -447,4 +573,125 @@ class TestAggregateConsistencyValidator:
 
         errors = validator.validate_consistency(test_aggregate)
         assert len(errors) > 0
-        assert any("does not belong to bounded context" in error for error in errors)
\ No newline at end of file
+        assert any("does not belong to bounded context" in error for error in errors)
+
+    def test_duplicate_entity_names_reported_once(self):
+        """Test that repeated entity names are reported as a single set."""
+        validator = AggregateConsistencyValidator()
+
+        def entity(name):
+            return DomainEntity(
+                name=name,
+                entity_id=str(uuid.uuid4()),
+                bounded_context="Orders",
+                attributes={}
+            )
+
+        aggregate = AggregateRoot(
+            name="Order",
+            aggregate_id=str(uuid.uuid4()),
+            bounded_context="Orders",
+            root_entity=entity("Order"),
+            child_entities=[entity("Line"), entity("Line"), entity("Order"), entity("Note")]
+        )
+
+        errors = validator.validate_consistency(aggregate)
+        assert len(errors) == 1
+        assert errors[0].startswith("Duplicate entity names found:")
+        assert "'Order'" in errors[0] and "'Line'" in errors[0] and "'Note'" not in errors[0]
+
+
+class TestRequirementDomainService:
+    """Test RequirementDomainService."""
+
+    def test_dependencies_from_shared_entities_and_related_contexts(self):
+        """Test dependencies come from shared entities or related contexts, in requirement order."""
+        service = RequirementDomainService()
+        requirements = [
+            {"id": "R1", "domain_entities": ["User"], "bounded_context": "User Management"},
+            {"id": "R2", "domain_entities": ["Session"], "bounded_context": "Authentication"},
+            {"id": "R3", "domain_entities": ["User", "Order"], "bounded_context": "Order Processing"},
+            {"id": "R4", "domain_entities": ["Invoice"], "bounded_context": "Payment"},
+            {"id": "R5", "domain_entities": ["Report"], "bounded_context": "Reporting"},
+        ]
+
+        dependencies = service.identify_requirement_dependencies(requirements)
+
+        assert dependencies == {
+            "R1": ["R2", "R3"],
+            "R2": ["R1"],
+            "R3": ["R1", "R4"],
+            "R4": ["R3"],
+            "R5": [],
+        }
+
+    def test_project_complexity_bucket_boundaries(self):
+        """Test an average on a threshold falls into the higher complexity scale."""
+        service = RequirementDomainService()
+
+        def complexity(*values):
+            return service.calculate_project_complexity(
+                [{"complexity": value, "story_points": 1} for value in values]
+            ).scale
+
+        assert complexity(1) == ComplexityScale.TRIVIAL
+        assert complexity(1, 2) == ComplexityScale.SIMPLE
+        assert complexity(2, 3) == ComplexityScale.MODERATE
+        assert complexity(3, 4) == ComplexityScale.COMPLEX
+        assert complexity(4, 5) == ComplexityScale.VERY_COMPLEX
+        assert complexity(5, 5) == ComplexityScale.VERY_COMPLEX
+        assert service.calculate_project_complexity([]).scale == ComplexityScale.TRIVIAL
+        assert service.calculate_project_complexity(
+            [{"complexity": 5, "story_points": 0}]
+        ).scale == ComplexityScale.TRIVIAL
+
+    def test_prioritize_requirements_orders_by_score(self):
+        """Test requirements are scored and returned highest score first."""
+        service = RequirementDomainService()
+        requirements = [
+            {"id": "R1", "business_value": 50, "priority": "low", "story_points": 4},
+            {"id": "R2", "business_value": 80, "priority": "Critical", "story_points": 4},
+            {"id": "R3", "business_value": 50, "priority": "unknown", "story_points": 1},
+        ]
+
+        prioritized = service.prioritize_requirements(requirements)
+
+        assert [req["id"] for req in prioritized] == ["R2", "R3", "R1"]
+        assert prioritized[0]["priority_score"] == 80.0
+        assert [req["id"] for req in requirements] == ["R1", "R2", "R3"]
+
+
+class TestProjectDomainService:
+    """Test ProjectDomainService."""
+
+    def test_ubiquitous_language_matches_whole_words(self):
+        """Test domain terms are found as whole words, ignoring case and surrounding punctuation."""
+        service = ProjectDomainService()
+        requirements = [
+            {"title": "User Profile", "description": "The (customer) places an Order."},
+            {"title": "Reporting", "description": "Show the user's dashboard: metrics"},
+            {"description": "Pay each invoice"},
+        ]
+
+        assert service.analyze_domain_model(requirements)["ubiquitous_language"] == [
+            "customer", "dashboard", "invoice", "order", "profile", "user"
+        ]
+
+    def test_context_map_follows_dependencies_across_contexts(self):
+        """Test the context map lists each other context a context depends on, once, in discovery order."""
+        service = ProjectDomainService()
+        requirements = [
+            {"id": "R1", "bounded_context": "Ordering", "depends_on": ["R3", "R2", "R4"]},
+            {"id": "R2", "bounded_context": "Billing", "depends_on": ["R1"]},
+            {"id": "R3", "bounded_context": "Shipping"},
+            {"id": "R4", "bounded_context": "Billing", "depends_on": ["R5"]},
+            {"id": "R5", "bounded_context": "Ordering", "depends_on": ["R2", "R9"]},
+        ]
+
+        context_map = service.analyze_domain_model(requirements)["context_map"]
+
+        assert context_map == {
+            "Ordering": ["Shipping", "Billing"],
+            "Billing": ["Ordering"],
+            "Shipping": [],
+        }